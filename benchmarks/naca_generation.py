@@ -0,0 +1,107 @@
+"""Compare the cost of generating 10k NACA profiles before and after the NACA kernel layer.
+
+"before" is the previous generation path, reproduced here: every profile recomputes its cosine spacing and
+thickness polynomial, and NACA5 parameters come from `scipy.interpolate.interp1d` objects built for each profile.
+"after" is the current `naca4`/`naca5` (one profile per call) and `naca4_many`/`naca5_many` (all at once). The
+script checks both produce the same coordinates, then prints the best of `REPEAT` timings. It exits non-zero if
+generating one profile per call has become slower than before.
+
+    python benchmarks/naca_generation.py
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+from airfoil.naca import naca4, naca5, naca4_many, naca5_many
+from airfoil.naca._naca4 import naca4_camber, naca4_camber_dyc_dx, naca4_thickness, naca_surfaces
+from airfoil.naca._naca5 import NACA5_REFLEX_TABLE, naca5_camber, naca5_camber_dyc_dx
+
+PROFILES = 10_000
+POINTS   = 100
+REPEAT   = 3
+
+
+def legacy_cosine_spacing(n:int) -> np.ndarray:
+    beta = np.linspace(0, np.pi, n)
+    return 0.5 * (1 - np.cos(beta))
+
+
+def legacy_naca4(max_thickness:float, max_camber:float, max_camber_position:float, n:int):
+    x = legacy_cosine_spacing(n)
+    thickness = naca4_thickness(x, max_thickness=max_thickness)
+    camber = naca4_camber(x, max_camber_position, max_camber)
+    dyc_dx = naca4_camber_dyc_dx(x, max_camber_position, max_camber)
+    return naca_surfaces(x, thickness, camber, dyc_dx)
+
+
+def legacy_naca5(design_lift_coefficient:float, max_camber_position:float, max_thickness:float, n:int):
+    from scipy.interpolate import interp1d
+    table = NACA5_REFLEX_TABLE
+    scale = design_lift_coefficient/0.3
+    r     = float(interp1d(table["p"], table["r"],     kind="linear")(max_camber_position))
+    k1    = float(interp1d(table["p"], table["k1"],    kind="linear")(max_camber_position))*scale
+    k2_k1 = float(interp1d(table["p"], table["k2_k1"], kind="linear")(max_camber_position))*scale
+    x = legacy_cosine_spacing(n)
+    thickness = naca4_thickness(x, max_thickness=max_thickness)
+    camber = naca5_camber(x, "reflex", k1, r, k2_k1)
+    dyc_dx = naca5_camber_dyc_dx(x, "reflex", k1, r, k2_k1)
+    return naca_surfaces(x, thickness, camber, dyc_dx)
+
+
+def best_of(function) -> float:
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> int:
+    rng = np.random.default_rng(0)
+    thickness       = rng.uniform(0.06, 0.20, PROFILES)
+    camber          = rng.uniform(0.00, 0.06, PROFILES)
+    camber_position = rng.uniform(0.20, 0.60, PROFILES)
+    naca5_position  = rng.uniform(0.10, 0.25, PROFILES)
+    lift            = rng.uniform(0.10, 0.60, PROFILES)
+    naca4_arguments = list(zip(thickness.tolist(), camber.tolist(), camber_position.tolist()))
+    naca5_arguments = list(zip(lift.tolist(), naca5_position.tolist(), thickness.tolist()))
+
+    for before, after in [
+        (legacy_naca4(*naca4_arguments[0], POINTS), naca4(*naca4_arguments[0])(POINTS)),
+        (legacy_naca5(*naca5_arguments[0], POINTS), naca5("reflex", *naca5_arguments[0])(POINTS)),
+    ]:
+        if not all(np.allclose(a, b, rtol=0, atol=1e-12) for a, b in zip(before, after)):
+            print("current generators differ from the previous ones")
+            return 1
+
+    timings = [
+        (
+            "NACA4",
+            best_of(lambda: [legacy_naca4(*a, POINTS) for a in naca4_arguments]),
+            best_of(lambda: [naca4(*a)(POINTS) for a in naca4_arguments]),
+            best_of(lambda: naca4_many(thickness, camber, camber_position)(POINTS)),
+        ),
+        (
+            "NACA5 (reflex)",
+            best_of(lambda: [legacy_naca5(*a, POINTS) for a in naca5_arguments]),
+            best_of(lambda: [naca5("reflex", *a)(POINTS) for a in naca5_arguments]),
+            best_of(lambda: naca5_many("reflex", lift, naca5_position, thickness)(POINTS)),
+        ),
+    ]
+    print(f"{PROFILES} profiles of {POINTS} points, best of {REPEAT}")
+    print(f"{'':16}{'before (loop)':>15}{'after (loop)':>15}{'after (_many)':>15}")
+    for name, *seconds in timings:
+        print(f"{name:16}" + "".join(f"{value*1e3:>12.0f} ms" for value in seconds))
+    slower = [name for name, before, after_loop, _ in timings if after_loop > before]
+    if slower:
+        print(f"one profile per call is slower than before for {', '.join(slower)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""Check that `remove_sequential_duplicates` scales linearly on large outlines.
+
+Dense circles of radius 500 mm (steps of a few microns, so long runs of points fall inside the tolerance), with every
+fifth point duplicated, are reduced at increasing sizes. The script exits non-zero if the cost per point at the largest
+size is more than `MAX_SLOWDOWN` times that at the smallest, or if the result differs from the original
+one-`np.allclose`-per-point loop on the smallest size.
+
+A million scattered points with only a handful of duplicates are reduced as well; that should cost little more than
+the vectorised comparison, and the script also exits non-zero if it takes more than `MAX_SPARSE_NS_PER_POINT`.
+
+    python benchmarks/remove_sequential_duplicates.py
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+from airfoil.util import remove_sequential_duplicates
+
+SIZES        = [100_000, 200_000, 400_000, 800_000]
+MAX_SLOWDOWN = 3.0
+
+SPARSE_SIZE             = 1_000_000
+SPARSE_DUPLICATES       = 10
+MAX_SPARSE_NS_PER_POINT = 150
+
+
+def reference(arr:np.ndarray) -> np.ndarray:
+    last = arr[0]
+    result = [last]
+    for item in arr[1:]:
+        if not np.allclose(item, last):
+            result.append(item)
+            last = item
+    return np.array(result)
+
+
+def dense_circle(n:int, radius:float=500) -> np.ndarray:
+    angle = np.linspace(0, 2*np.pi, n)
+    points = radius*np.column_stack([np.cos(angle), np.sin(angle)])
+    return np.repeat(points, np.where(np.arange(n) % 5 == 0, 2, 1), axis=0)
+
+
+def sparse_duplicates(n:int, duplicates:int) -> np.ndarray:
+    points = np.random.default_rng(0).uniform(-500, 500, (n, 2))
+    return np.repeat(points, np.where(np.arange(n) % (n//duplicates) == 1, 2, 1), axis=0)
+
+
+def best_of(function, repeat:int=3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> int:
+    smallest = dense_circle(SIZES[0])
+    if not np.array_equal(remove_sequential_duplicates(smallest), reference(smallest)):
+        print("result differs from the reference loop")
+        return 1
+
+    per_point = []
+    for size in SIZES:
+        points = dense_circle(size)
+        seconds = best_of(lambda: remove_sequential_duplicates(points))
+        kept = len(remove_sequential_duplicates(points))
+        per_point.append(seconds/len(points))
+        print(f"{len(points):>9} points  {seconds*1e3:8.1f} ms  {per_point[-1]*1e9:6.0f} ns/point  {kept:>9} kept")
+
+    slowdown = per_point[-1]/per_point[0]
+    print(f"cost per point grew {slowdown:.2f}x from {SIZES[0]} to {SIZES[-1]} (limit {MAX_SLOWDOWN}x)")
+
+    points = sparse_duplicates(SPARSE_SIZE, SPARSE_DUPLICATES)
+    seconds = best_of(lambda: remove_sequential_duplicates(points))
+    kept = len(remove_sequential_duplicates(points))
+    sparse_ns_per_point = seconds/len(points)*1e9
+    print(
+        f"{len(points):>9} points  {seconds*1e3:8.1f} ms  {sparse_ns_per_point:6.0f} ns/point  {kept:>9} kept"
+        f"  (sparse duplicates, limit {MAX_SPARSE_NS_PER_POINT} ns/point)"
+    )
+    if kept != SPARSE_SIZE:
+        print("sparse duplicates were not all removed")
+        return 1
+    return 0 if slowdown <= MAX_SLOWDOWN and sparse_ns_per_point <= MAX_SPARSE_NS_PER_POINT else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
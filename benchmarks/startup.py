@@ -0,0 +1,55 @@
+"""Check that `import airfoil` stays fast enough for short-lived workers.
+
+Each run starts a fresh interpreter and times `import airfoil` followed by generating one airfoil. The best of
+`RUNS` (the first run may also be compiling `.pyc` files) must be under `TARGET_SECONDS`, and the plotting and
+meshing backends must not have been imported. Exits non-zero otherwise.
+
+    python benchmarks/startup.py
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+TARGET_SECONDS = 0.5
+RUNS           = 5
+HEAVY_MODULES  = ["matplotlib", "pyvista", "vtkmodules", "pandas", "scipy"]
+
+CHILD = f"""
+import sys, time
+start = time.perf_counter()
+import airfoil
+from airfoil import Airfoil
+Airfoil.from_naca_designation("2412", chord_length=150)
+seconds = time.perf_counter() - start
+print(seconds, *[name for name in {HEAVY_MODULES!r} if name in sys.modules])
+"""
+
+
+def main() -> int:
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(
+        [str(Path(__file__).parents[1] / "src"), *filter(None, [environment.get("PYTHONPATH")])]
+    )
+    times = []
+    loaded = set()
+    for _ in range(RUNS):
+        output = subprocess.run(
+            [sys.executable, "-c", CHILD],
+            env            = environment,
+            capture_output = True,
+            text           = True,
+            check          = True,
+        ).stdout.split()
+        times.append(float(output[0]))
+        loaded.update(output[1:])
+
+    best = min(times)
+    print(f"import airfoil + from_naca_designation: best {best*1e3:.0f} ms of {RUNS} (target {TARGET_SECONDS*1e3:.0f} ms)")
+    if loaded:
+        print(f"heavy modules imported at startup: {', '.join(sorted(loaded))}")
+    return 0 if best <= TARGET_SECONDS and not loaded else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,7 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from airfoil._airfoil import Airfoil
 
+from ._DecomposerCache import DecomposerCache, default_decomposer_cache
 from .util import (
     remove_sequential_duplicates,
     split_linestring_by_angle,
@@ -10,7 +11,7 @@ from .util import (
 )
 
 import numpy as np
-from shapely import Point, difference, geometry, unary_union
+import shapely
 
 from warnings import warn
 from pydantic import BaseModel, Field, PrivateAttr
@@ -24,61 +25,119 @@ class Decomposer(BaseModel):
     
     Repeated use of the same Decomposer object will attempt to produce the same number of points on each corresponding
     segment of the airfoil outline. A threshold angle is used to break the outline into segments at some deflection
-    angle."""
+    angle.
+    
+    Results are memoised in `cache` (shared by all decomposers by default). Pass `cache=None` to disable this."""
+    class Config:
+        arbitrary_types_allowed = True
+
     upcut_kerf                  :float          = 0.01
     buffer                      :float          = 0
     tolerance                   :float          = 0.001
     split_angle_deg             :float          = 70
     segment_target_length       :float          = 1.0
     minimum_initial_point_count :int            = 200
+    cache                       :DecomposerCache|None = Field(default_factory=lambda:default_decomposer_cache, exclude=True, repr=False)
     _length_counts              :list[int]|None = PrivateAttr(default_factory=lambda:None, init=False)
 
     def clone(self):
         import copy
         return copy.copy(self)
 
-    def decompose_many(self, airfoils:list[Airfoil]):
+    def decompose_many(self, airfoils:list[Airfoil]) -> list[list[np.ndarray]]:
+        """Decompose several airfoils at once. The shapely boolean operations for all airfoils are performed together
+        using shapely's vectorised functions. The result is the same as calling `decompose` on each airfoil in order."""
+        if self.cache is None:
+            return self._decompose_many_uncached(airfoils)
         result = []
-        for airfoil in airfoils:
-            result.append(self.decompose(airfoil))
+        if self._length_counts is None and len(airfoils)>0:
+            # the first airfoil decides the length counts, which form part of the cache key for the rest
+            result += self._decompose_many_cached(airfoils[:1])
+            airfoils = airfoils[1:]
+        return result + self._decompose_many_cached(airfoils)
+
+    def decompose(self, airfoil:Airfoil) -> list[np.ndarray]:
+        return self.decompose_many([airfoil])[0]
+
+    def _decompose_many_cached(self, airfoils:list[Airfoil]) -> list[list[np.ndarray]]:
+        assert self.cache is not None
+        keys = [DecomposerCache.key(airfoil, self) for airfoil in airfoils]
+        entries = [self.cache.get(key) for key in keys]
+        missing = [index for index, entry in enumerate(entries) if entry is None]
+        for index, chunks in zip(missing, self._decompose_many_uncached([airfoils[index] for index in missing])):
+            self.cache.put(keys[index], chunks, self._length_counts)
+            entries[index] = (chunks, self._length_counts)
+        result = []
+        for chunks, length_counts in entries:
+            self._length_counts = length_counts
+            result.append(chunks)
         return result
 
-    def decompose(self, airfoil:Airfoil):
+    def _decompose_many_uncached(self, airfoils:list[Airfoil]) -> list[list[np.ndarray]]:
+        return [self._resample_outline(outline) for outline in self._outlines(airfoils)]
+
+    def _outlines(self, airfoils:list[Airfoil]) -> list[np.ndarray]:
+        """Subtract holes, upcuts and hinges from each airfoil and return each outline as a (n,2) array starting from
+        the top-right and running clockwise"""
+        holes = [(index, hole) for index, airfoil in enumerate(airfoils) for hole in airfoil.holes]
+        hinges = [(index, airfoil.hinge) for index, airfoil in enumerate(airfoils) if airfoil.hinge is not None]
 
-        if any(hole.diameter_mm/2-self.buffer<self.buffer/2 for hole in airfoil.holes):
+        if any(hole.diameter_mm/2-self.buffer<self.buffer/2 for _, hole in holes):
             warn(f"some holes will be buffered down to minimum size of the buffer/2={self.buffer/2}mm")
 
-        shape_holes = [
-            Point(hole.position)
-            .buffer(max(self.buffer/4, hole.diameter_mm/2-self.buffer))
-            for hole
-            in airfoil.holes
-        ]
-        height=airfoil.bounding_size()[1]*10
-        shape_upcuts = [
-            geometry.box(
-                *(hole.position+np.array([-self.upcut_kerf/2, 0])),
-                *(hole.position+np.array([ self.upcut_kerf  ,height]))
-            ) for hole in airfoil.holes
-        ]
-
-        shape_airfoil = airfoil.polygon().simplify(tolerance=self.tolerance)
-        shape_hinges = [] if airfoil.hinge is None else [airfoil.hinge.to_polygon()]
-        if self.buffer>0:
-            shape_airfoil = shape_airfoil.buffer(self.buffer,quad_segs=1, join_style="mitre")
-            shape_hinges = [hinge.buffer(-self.buffer,quad_segs=1,join_style="mitre") for hinge in shape_hinges]
-
-        lsb = difference(
-            airfoil.polygon().simplify(tolerance=self.tolerance).buffer(self.buffer),
-            unary_union(shape_holes+shape_upcuts+shape_hinges)
+        shape_airfoils = shapely.buffer(
+            shapely.simplify(
+                np.array([airfoil.to_polygon() for airfoil in airfoils]),
+                tolerance=self.tolerance
+            ),
+            self.buffer,
+            quad_segs=16,
+        )
+
+        hole_owner = np.array([index for index, _ in holes], dtype=int)
+        hole_position = np.array([hole.position for _, hole in holes], dtype=float).reshape(-1,2)
+        hole_diameter = np.array([hole.diameter_mm for _, hole in holes], dtype=float)
+        height = np.array([airfoil.bounding_size()[1]*10 for airfoil in airfoils])[hole_owner]
+        shape_holes = shapely.buffer(
+            shapely.points(hole_position),
+            np.maximum(self.buffer/4, hole_diameter/2-self.buffer),
+            quad_segs=16,
+        )
+        shape_upcuts = shapely.box(
+            hole_position[:,0]-self.upcut_kerf/2,
+            hole_position[:,1],
+            hole_position[:,0]+self.upcut_kerf,
+            hole_position[:,1]+height,
         )
-        if lsb.geom_type == "MultiPolygon":
-            raise ValueError("Airfoil shape did not generate properly (split into multi-polygon), this often happens if the Hole or Hinge features have split the airfoil into two parts which is not allowed. Try .plot_raw(show_hinge=True, show_holes=True) to diagnose.")
-        if lsb.is_empty:
-            raise ValueError("Airfoil shape did not generate properly (empty), this might have happened if the Hole or Hinge features entirely covered the airfoil shape. Try .plot_raw(show_hinge=True, show_holes=True) to diagnose.")
-        lsb = np.array(lsb.boundary.coords)
-        lsb = np.roll(lsb,-(lsb[:,0]+lsb[:,1]).argmax()-1, axis=0)[::-1]
 
+        hinge_owner = np.array([index for index, _ in hinges], dtype=int)
+        shape_hinges = np.array([hinge.to_polygon() for _, hinge in hinges], dtype=object)
+        if self.buffer>0 and len(shape_hinges)>0:
+            shape_hinges = shapely.buffer(shape_hinges, -self.buffer, quad_segs=1, join_style="mitre")
+
+        # one row of cutting shapes per airfoil, padded with None which is ignored by union_all
+        cutter_owner = np.concatenate([hole_owner, hole_owner, hinge_owner])
+        order = np.argsort(cutter_owner, kind="stable")
+        cutter_column = np.empty(len(cutter_owner), dtype=int)
+        cutter_column[order] = np.arange(len(order)) - np.searchsorted(cutter_owner[order], cutter_owner[order])
+        cutters = np.full((len(airfoils), cutter_column.max(initial=-1)+1), None, dtype=object)
+        cutters[cutter_owner, cutter_column] = np.concatenate([shape_holes, shape_upcuts, shape_hinges])
+        cuts = shapely.union_all(cutters, axis=1) if cutters.shape[1]>0 else np.full(len(airfoils), shapely.Polygon())
+
+        results = shapely.difference(shape_airfoils, cuts)
+        outlines = []
+        for lsb in results:
+            if lsb.geom_type == "MultiPolygon":
+                raise ValueError("Airfoil shape did not generate properly (split into multi-polygon), this often happens if the Hole or Hinge features have split the airfoil into two parts which is not allowed. Try .plot_raw(show_hinge=True, show_holes=True) to diagnose.")
+            if lsb.is_empty:
+                raise ValueError("Airfoil shape did not generate properly (empty), this might have happened if the Hole or Hinge features entirely covered the airfoil shape. Try .plot_raw(show_hinge=True, show_holes=True) to diagnose.")
+            lsb = np.array(lsb.boundary.coords)
+            outlines.append(np.roll(lsb,-(lsb[:,0]+lsb[:,1]).argmax()-1, axis=0)[::-1])
+        return outlines
+
+    def _resample_outline(self, lsb:np.ndarray) -> list[np.ndarray]:
+        """Split an outline into chunks at the leading edge and at sharp corners, then resample each chunk. The first
+        call records the number of points in each chunk, and subsequent calls will match it."""
         lsb = remove_sequential_duplicates(lsb)
 
         leading_edge_split = lsb[:,0].argmin()
@@ -102,6 +161,8 @@ class Decomposer(BaseModel):
             ]
             self._length_counts = [len(chunk) for chunk in result]
         else:
+            if len(chunks)!=len(self._length_counts):
+                warn(f"Airfoil outline split into {len(chunks)} chunks but this Decomposer was first used on an outline with {len(self._length_counts)} chunks. Only the first {min(len(chunks), len(self._length_counts))} chunks will be kept. Try a different split_angle_deg.")
             result = [
                 resample_spline_fallback_linear(
                     chunk,
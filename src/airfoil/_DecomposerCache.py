@@ -0,0 +1,124 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from airfoil._airfoil import Airfoil
+    from airfoil._Decomposer import Decomposer
+
+from collections import OrderedDict
+from hashlib import blake2b
+from pathlib import Path
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+
+class DecomposerCache:
+    """Memoises `Decomposer` results, keyed by a hash of the airfoil points, holes, hinge, the decomposer's settings
+    and its locked `_length_counts`.
+
+    Up to `max_entries` results are kept in memory, discarding the least recently used. If `directory` is given,
+    results are also written there as `.npz` files, and read back when they are not found in memory. Files are
+    written to a temporary name and renamed into place, so several processes can share a directory; a file that
+    cannot be read is treated as a miss.
+
+    `hits` and `misses` count lookups since the cache was created or last cleared.
+    """
+    def __init__(self, max_entries:int=256, directory:Path|str|None=None):
+        self.max_entries = max_entries
+        self.directory   = None if directory is None else Path(directory)
+        self.hits        = 0
+        self.misses      = 0
+        self._entries:OrderedDict[str, tuple[list[np.ndarray], list[int]]] = OrderedDict()
+
+    def __repr__(self) -> str:
+        return f"<DecomposerCache entries={len(self._entries)}/{self.max_entries} hits={self.hits} misses={self.misses} directory={self.directory} />"
+
+    def __getstate__(self):
+        # entries are not sent along when a decomposer is pickled to another process
+        state = self.__dict__.copy()
+        state["_entries"] = OrderedDict()
+        return state
+
+    @staticmethod
+    def key(airfoil:Airfoil, decomposer:Decomposer) -> str:
+        digest = blake2b(digest_size=20)
+        points = np.ascontiguousarray(airfoil.points, dtype=float)
+        digest.update(repr(points.shape).encode("ascii"))
+        digest.update(points.tobytes())
+        for hole in airfoil.holes:
+            digest.update(repr(("hole", hole.diameter_mm, *np.asarray(hole.position, dtype=float).tolist())).encode("ascii"))
+        if airfoil.hinge is not None:
+            hinge = airfoil.hinge
+            digest.update(repr((
+                "hinge",
+                *np.asarray(hinge.position, dtype=float).tolist(),
+                hinge.angle_deg,
+                hinge.rotation_deg,
+                hinge.height,
+            )).encode("ascii"))
+        digest.update(repr(sorted(decomposer.model_dump(exclude={"cache"}).items())).encode("ascii"))
+        digest.update(repr(decomposer._length_counts).encode("ascii"))
+        return digest.hexdigest()
+
+    def get(self, key:str) -> tuple[list[np.ndarray], list[int]]|None:
+        """Returns copies of the cached `(chunks, length_counts)` or `None` on a miss"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        elif self.directory is not None and (file := self.directory / f"{key}.npz").exists():
+            entry = self._load(file)
+            if entry is not None:
+                self._store(key, entry)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        chunks, length_counts = entry
+        return [chunk.copy() for chunk in chunks], list(length_counts)
+
+    def put(self, key:str, chunks:list[np.ndarray], length_counts:list[int]):
+        entry = ([np.array(chunk) for chunk in chunks], list(length_counts))
+        self._store(key, entry)
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            file_descriptor, temporary = tempfile.mkstemp(dir=self.directory, prefix=f".{key}.", suffix=".tmp")
+            try:
+                with os.fdopen(file_descriptor, "wb") as file:
+                    np.savez(
+                        file,
+                        length_counts=np.array(length_counts, dtype=int),
+                        **{f"chunk_{index}":chunk for index, chunk in enumerate(entry[0])},
+                    )
+                os.replace(temporary, self.directory / f"{key}.npz")
+            except BaseException:
+                Path(temporary).unlink(missing_ok=True)
+                raise
+
+    def clear(self):
+        """Empties the in-memory store and resets the counters. Files in `directory` are left alone."""
+        self._entries.clear()
+        self.hits   = 0
+        self.misses = 0
+
+    @staticmethod
+    def _load(file:Path) -> tuple[list[np.ndarray], list[int]]|None:
+        try:
+            with np.load(file) as data:
+                return (
+                    [data[f"chunk_{index}"] for index in range(len(data.files)-1)],
+                    data["length_counts"].tolist(),
+                )
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            return None
+
+    def _store(self, key:str, entry:tuple[list[np.ndarray], list[int]]):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+default_decomposer_cache = DecomposerCache()
+"""Shared by every `Decomposer` unless it is given its own `cache` (or `cache=None` to disable caching)"""
@@ -8,10 +8,6 @@ from ._WingSegment import WingSegment
 import numpy as np
 from numpy.typing import ArrayLike
 
-import pyvista as pv
-import matplotlib.pyplot as plt
-from matplotlib.axes import Axes
-
 from pydantic import BaseModel
 
 class Wing(BaseModel):
@@ -47,16 +43,44 @@ class Wing(BaseModel):
             mirrored                 = mirrored,
         )
     
-    def to_meshes(self):
+    @classmethod
+    def from_outlines(
+        cls,
+        outlines:np.ndarray,
+        positions:ArrayLike,
+        first_segment_is_central:bool,
+        mirrored:bool
+    ):
+        """Build a wing from `(stations, points, 2)` outlines at each of `positions`, such as those produced by a
+        sampler from `Airfoil.create_batch_sampler`"""
+        positions = np.asarray(positions, dtype=float)
+        airfoils = [Airfoil(points=outline) for outline in outlines]
+        return Wing(
+            segments = [
+                WingSegment(
+                    left   = left,
+                    right  = right,
+                    length = length,
+                )
+                for left, right, length
+                in zip(airfoils[:-1], airfoils[1:], np.diff(positions).tolist())
+            ],
+            first_segment_is_central = first_segment_is_central,
+            mirrored                 = mirrored,
+        )
+
+    def to_meshes(self, parallel:bool=False, max_workers:int|None=None):
         return WingSegment.to_meshes(
             segments=self.segments,
             add_mirrored=self.mirrored,
-            first_segment_is_central = self.first_segment_is_central
+            first_segment_is_central = self.first_segment_is_central,
+            parallel=parallel,
+            max_workers=max_workers,
         )
     
-    def to_mesh(self):
+    def to_mesh(self, parallel:bool=False, max_workers:int|None=None):
         result = None
-        for mesh in self.to_meshes():
+        for mesh in self.to_meshes(parallel=parallel, max_workers=max_workers):
             if result is None:
                 result = mesh
             else:
@@ -1,19 +1,20 @@
 from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
 from warnings import warn, deprecated
 from ._Decomposer import Decomposer
 from ._airfoil import Airfoil
 from .util import (
     remove_sequential_duplicates,
     ensure_closed,
-    create_ruled_surface
 )
 
 import numpy as np
 from numpy.typing import ArrayLike
 
-import pyvista as pv
-import matplotlib.pyplot as plt
-from matplotlib.axes import Axes
+if TYPE_CHECKING:
+    import pyvista as pv
+    from matplotlib.axes import Axes
 
 from pydantic import BaseModel
 
@@ -103,6 +104,8 @@ class WingSegment(BaseModel):
         mesha = self.left.to_mesh(decomposer).rotate_x(90).rotate_z(90).translate((-self.length/2,0,0)).flip_faces()
         meshb = self.right.to_mesh(decomposer).rotate_x(90).rotate_z(90).translate(( self.length/2,0,0))
 
+        import pyvista as pv
+        from .util._pyvista_helpers import create_ruled_surface
         meshc = create_ruled_surface(a_3d,b_3d)
         mesh_target = pv.merge([mesha, meshb, meshc]).clean().fill_holes(hole_size=20)
         mesh_target = mesh_target.compute_normals(auto_orient_normals=True)
@@ -119,6 +122,7 @@ class WingSegment(BaseModel):
     
     def plot_2d(self, ax:Axes|None=None):
         if ax is None:
+            import matplotlib.pyplot as plt
             _, ax = plt.subplots()
         l,r = self.decompose()
         for line in l+r:
@@ -129,6 +133,7 @@ class WingSegment(BaseModel):
     @classmethod
     def plot_wing_segments(cls, segments:list[WingSegment], pt:pv.Plotter|None=None, decomposer:Decomposer|None=None):
         if pt is None:
+            import pyvista as pv
             pt = pv.Plotter()
         wing_meshes = WingSegment.to_meshes(segments=segments, decomposer=decomposer)
         for m in wing_meshes:
@@ -143,25 +148,62 @@ class WingSegment(BaseModel):
         add_mirrored:bool=False,
         share_decomposer:bool=False,
         first_segment_is_central:bool=True,
+        parallel:bool=False,
+        max_workers:int|None=None,
     ):
+        """Mesh each segment and place them end to end along the x axis.
+
+        `parallel=True` meshes the segments in a process pool with `max_workers` processes
+        (default: one per CPU). The result is the same as when meshing in series."""
         if decomposer is None:
             decomposer = Decomposer()
         o = 0
         wing_meshes = []
-        for i, segment in enumerate(segments):
-            if share_decomposer:
-                current_decomposer = decomposer
-            else:
-                current_decomposer = decomposer.clone()
+        segment_meshes = cls._segment_meshes(
+            segments,
+            decomposer       = decomposer,
+            share_decomposer = share_decomposer,
+            parallel         = parallel,
+            max_workers      = max_workers,
+        )
+        for i, (segment, msh) in enumerate(zip(segments, segment_meshes)):
             if not first_segment_is_central or i > 0:
                 o += segment.length / 2
-            msh = segment.to_mesh(current_decomposer)
             wing_meshes.append(msh.translate([o,0,0]))
             if add_mirrored and (i>0 or not first_segment_is_central):
                 wing_meshes.append(msh.scale([-1,1,1]).translate([-o,0,0]).flip_faces())
             o += segment.length/2
         return wing_meshes
 
+    @classmethod
+    def _segment_meshes(
+        cls,
+        segments:list[WingSegment],
+        decomposer:Decomposer,
+        share_decomposer:bool,
+        parallel:bool,
+        max_workers:int|None,
+    ) -> list[pv.PolyData]:
+        if not parallel:
+            return [
+                segment.to_mesh(decomposer if share_decomposer else decomposer.clone())
+                for segment in segments
+            ]
+        segment_meshes = []
+        remaining = segments
+        if share_decomposer and decomposer._length_counts is None and len(segments)>0:
+            # the first segment locks in the point counts of a shared decomposer,
+            # after which every other segment can safely use a copy of it
+            segment_meshes.append(segments[0].to_mesh(decomposer))
+            remaining = segments[1:]
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            segment_meshes.extend(pool.map(
+                WingSegment.to_mesh,
+                remaining,
+                [decomposer.clone() for _ in remaining],
+            ))
+        return segment_meshes
+
     @classmethod
     @deprecated("use to_meshes with share_decomposer=True")
     def to_meshes_unshared_decomposer(cls, segments:list[WingSegment], decomposer:Decomposer|None=None, add_mirrored:bool=False):
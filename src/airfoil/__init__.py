@@ -1,5 +1,7 @@
 from ._WingSegment import WingSegment
 from ._Decomposer import Decomposer
+from ._DecomposerCache import DecomposerCache, default_decomposer_cache
+from ._airfoil_core import AirfoilCore
 from ._airfoil import (
     Airfoil,
     Hole,
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Callable, Literal
+from typing import Callable, Literal, TYPE_CHECKING
 from pathlib import Path
 from warnings import deprecated
 
@@ -8,23 +8,22 @@ from pydantic import BaseModel, Field
 import numpy as np
 from numpy.typing import ArrayLike
 
-import matplotlib.pyplot as plt
-from matplotlib.axes import Axes
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
 
-from shapely import LineString, Polygon, Point, constrained_delaunay_triangles, intersection
-
-import pyvista as pv
+from shapely import LineString, Polygon, Point, intersection
 
 from airfoil._pydantic_helper_types import NDArray
 
-from .naca import naca, naca4, naca5
+from .naca import naca, naca4, naca5, naca4_many
 from .util import (
     remove_sequential_duplicates,
     ensure_closed,
-    is_ccw
+    is_ccw,
 )
 
 from ._Decomposer import Decomposer
+from ._airfoil_core import AirfoilCore
 
 
 class Hole(BaseModel):
@@ -98,6 +97,18 @@ class Hinge(BaseModel):
         return Polygon(triangle_points)
 
 
+def _outlines_from_upper_lower(upper:np.ndarray, lower:np.ndarray) -> np.ndarray:
+    """Closed selig-ordered outline(s) from upper and lower surfaces of shape `(n, 2)` or `(k, n, 2)`, starting and
+    ending midway between the two trailing edge points"""
+    selig = np.concatenate((upper[..., ::-1, :], lower[..., 1:, :]), axis=-2)
+    average_terminator = (selig[..., :1, :]+selig[..., -1:, :])/2
+    return np.concatenate([
+        average_terminator,
+        selig,
+        average_terminator
+    ], axis=-2)
+
+
 class Airfoil(BaseModel):
     class Config:
         frozen=True
@@ -127,14 +138,7 @@ class Airfoil(BaseModel):
         upper:np.ndarray,
         lower:np.ndarray,
     ):
-        selig = np.vstack((upper[::-1], lower[1:]))
-        average_terminator = (selig[0]+selig[-1])/2
-        selig = np.concatenate([
-            [average_terminator],
-            selig,
-            [average_terminator]
-        ])
-        return Airfoil(points=selig)
+        return Airfoil(points=_outlines_from_upper_lower(upper, lower))
     
     @classmethod
     def from_naca4(
@@ -152,6 +156,27 @@ class Airfoil(BaseModel):
         )(n=points)
         return Airfoil._from_upper_lower(upper,lower).with_chord(chord_length)
     
+    @classmethod
+    def outlines_from_naca4(
+            cls,
+            max_camber:ArrayLike,
+            max_camber_position:ArrayLike,
+            max_thickness:ArrayLike,
+            chord_length:ArrayLike=1,
+            points:int=100,
+        ) -> np.ndarray:
+        """The outlines `from_naca4` would produce for arrays of parameters (one value per profile, or a scalar shared
+        by all of them), generated together as a `(k, 2*points+1, 2)` array"""
+        upper, lower = naca4_many(
+            max_thickness=max_thickness,
+            max_camber_position=max_camber_position,
+            max_camber=max_camber,
+        )(n=points)
+        outlines = _outlines_from_upper_lower(upper, lower)
+        # the same scaling as `with_chord`
+        chord = outlines[..., 0].max(axis=-1) - outlines[..., 0].min(axis=-1)
+        return outlines * (np.asarray(chord_length, dtype=float)/chord)[:, np.newaxis, np.newaxis]
+    
     @classmethod
     def from_naca5(
         cls,
@@ -227,15 +252,68 @@ class Airfoil(BaseModel):
         washout         : Callable[[float], float] = lambda x: 0,
         rotation_center : Callable[[float], float] = lambda x: 0,
     ) -> Callable[[float], Airfoil]:
+        # the transforms are composed on an `AirfoilCore`, so the points are only transformed once per station
         return lambda x: (
             airfoil(x)
+            .to_core()
             .with_chord(chord(x))
             .with_translation((-rotation_center(x),0))
             .with_rotation(washout(x))
             .with_translation((rotation_center(x),0))
             .with_translation((-leading_edge(x), dihedral(x)))
+            .to_airfoil()
         )
 
+    @classmethod
+    def create_batch_sampler(
+        cls,
+        airfoil         : Airfoil|Callable[[np.ndarray], np.ndarray],
+        leading_edge    : Callable[[np.ndarray], ArrayLike] = lambda x: 0,
+        dihedral        : Callable[[np.ndarray], ArrayLike] = lambda x: 0,
+        chord           : Callable[[np.ndarray], ArrayLike] = lambda x: 100,
+        washout         : Callable[[np.ndarray], ArrayLike] = lambda x: 0,
+        rotation_center : Callable[[np.ndarray], ArrayLike] = lambda x: 0,
+    ) -> Callable[[ArrayLike], np.ndarray]:
+        """Like `create_sampler`, but samples a whole array of span positions at once and returns the outlines
+        stacked in a `(stations, points, 2)` array.
+
+        Each function is called once with the `(stations,)` array of positions, so it must broadcast over it (numpy
+        expressions, `auto_interpolate` and `auto_piecewise` do); a scalar result applies to every station. `airfoil`
+        is either one `Airfoil` used at every station, or a function returning `(stations, points, 2)` outlines.
+        Holes and hinges are not part of the outlines; use `create_sampler` if they are needed.
+
+        ```python
+        sampler = Airfoil.create_batch_sampler(Airfoil.from_naca_designation("2412"), chord=lambda x: 150 - x*0.1)
+        outlines = sampler(np.linspace(0, 500, 1000))
+        ```
+        """
+        def _sample(positions:ArrayLike) -> np.ndarray:
+            x = np.asarray(positions, dtype=float).reshape(-1)
+            def evaluate(function:Callable[[np.ndarray], ArrayLike]) -> np.ndarray:
+                return np.broadcast_to(np.asarray(function(x), dtype=float), x.shape)[:, np.newaxis]
+
+            if isinstance(airfoil, Airfoil):
+                outlines = np.broadcast_to(airfoil.points, (len(x), *airfoil.points.shape))
+            else:
+                outlines = np.asarray(airfoil(x), dtype=float)
+            outline_x, outline_y = outlines[..., 0], outlines[..., 1]
+
+            # the same transforms as `create_sampler`, broadcast over stations
+            scale = evaluate(chord)/(outline_x.max(axis=1, keepdims=True) - outline_x.min(axis=1, keepdims=True))
+            center = evaluate(rotation_center)
+            rotation_rad = np.deg2rad(evaluate(washout))
+            cos, sin = np.cos(rotation_rad), np.sin(rotation_rad)
+            scaled_x = outline_x*scale - center
+            scaled_y = outline_y*scale
+            return np.stack([
+                scaled_x*cos + scaled_y*sin + center - evaluate(leading_edge),
+                scaled_y*cos - scaled_x*sin + evaluate(dihedral),
+            ], axis=-1)
+        return _sample
+
+    def to_core(self) -> AirfoilCore:
+        return AirfoilCore.from_airfoil(self)
+
     def with_holes(self, holes:list[Hole]) -> Airfoil:
         return Airfoil(
             points = self.points,
@@ -272,44 +350,14 @@ class Airfoil(BaseModel):
         return self.with_scale([new_chord/self.compute_chord()]*2)
     
     def with_translation(self, translation:ArrayLike)->Airfoil:
-        translation = np.array(translation)
-        assert translation.shape==(2,), "Translation must be an ndarray of shape (2,)"
-        return Airfoil(
-            points = self.points+translation.reshape(1,-1),
-            holes  = [hole.with_position(hole.position+translation) for hole in self.holes],
-            hinge  =  None if self.hinge is None else 
-                self.hinge.with_position(self.hinge.position + translation),
-        )
+        return self.to_core().with_translation(translation).to_airfoil()
     
     def with_rotation(self, rotation_deg:float)->Airfoil:
-        rotation_rad = np.deg2rad(rotation_deg)
-        rotation_matrix = np.array([
-            [np.cos(rotation_rad), -np.sin(rotation_rad)],
-            [np.sin(rotation_rad),  np.cos(rotation_rad)]
-        ])
-        return Airfoil(
-            points = self.points @ rotation_matrix,
-            holes  = [hole.with_position(hole.position@rotation_matrix) for hole in self.holes],
-            hinge  = None if self.hinge is None else Hinge(
-                position     = self.hinge.position @ rotation_matrix,
-                rotation_deg = self.hinge.rotation_deg + rotation_deg,
-                angle_deg    = self.hinge.angle_deg,
-                height       = self.hinge.height,
-            ),
-        )
+        return self.to_core().with_rotation(rotation_deg).to_airfoil()
     
     def with_scale(self, scale:ArrayLike) -> Airfoil:
         """TODO: Does not currently scale holes"""
-        scale = np.array(scale)
-        assert scale.shape==(2,), "Scale must be an ndarray of shape (2,)"
-        scale_reshaped = scale.reshape(-1,2)
-        return Airfoil(
-            points = self.points * scale_reshaped,
-            holes  = [hole.with_position(hole.position*scale) for hole in self.holes],
-            hinge  = None if self.hinge is None else self.hinge.with_position(
-                self.hinge.position * scale,
-            )
-        )
+        return self.to_core().with_scale(scale).to_airfoil()
 
     def show(self):
         from IPython.display import display
@@ -343,6 +391,7 @@ class Airfoil(BaseModel):
             decomposer:Decomposer|None=None
         ):
         if ax is None:
+            import matplotlib.pyplot as plt
             fig,ax = plt.subplots(figsize=(10,10))
         if decomposer is None:
             decomposer = Decomposer()
@@ -363,6 +412,7 @@ class Airfoil(BaseModel):
         """plot outline, holes and hinge without performing boolean operations
         This is useful to diagnose issues (e.g. your hinge cut is dividing the airfoil into two parts, or a hole doesn't lie within the airfoil.)"""
         if ax is None:
+            import matplotlib.pyplot as plt
             fig,ax = plt.subplots(figsize=(10,10))
         
         ax.plot(*self.points.transpose(),"o-",markersize=marker_size,**kwargs)
@@ -383,28 +433,8 @@ class Airfoil(BaseModel):
             decomposer = Decomposer()
         chunks = decomposer.decompose(self)
         s =  ensure_closed(remove_sequential_duplicates(np.concat(chunks)))
-        pol = Polygon(s)
-        triangles = constrained_delaunay_triangles(pol)
-        # Collect all vertices and faces
-        all_vertices = []
-        all_faces = []
-        vertex_offset = 0
-        for triangle in triangles.geoms:
-            if pol.contains(triangle.centroid):
-                # Extract triangle vertices
-                coords = np.array(triangle.exterior.coords[:-1])  # Remove duplicate last point
-                # Add to vertex list
-                all_vertices.extend(coords)
-                # Create face indices (triangle with 3 vertices)
-                face = [3, vertex_offset, vertex_offset + 1, vertex_offset + 2]
-                all_faces.extend(face)
-                vertex_offset += 3
-        vertices_array = np.array(all_vertices)
-        faces_array = np.array(all_faces)
-        points_3d = np.insert(vertices_array, 2, 0, axis=-1)
-        mesh = pv.PolyData(points_3d, faces_array)
-        mesh = mesh.clean(tolerance=1e-6)
-        return mesh#, [len(item) for item in chunks]
+        from .util._pyvista_helpers import mesh_from_polygon
+        return mesh_from_polygon(Polygon(s), normal_axis=2)
     
     def bounding_size(self):
         return self.points.max(axis=1)-self.points.min(axis=1)
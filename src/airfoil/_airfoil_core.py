@@ -0,0 +1,164 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from airfoil._airfoil import Airfoil
+
+import math
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+
+class AirfoilCore:
+    """A lightweight, array-backed airfoil for chains of transforms, such as those applied at every station of a
+    wing by `Airfoil.create_sampler`.
+
+    The outline, hole centers and diameters and hinge parameters are plain arrays shared between cores. Each `with_*`
+    method only composes a 3x3 affine matrix, which is applied when `points` (or a hole or hinge position) is first
+    read. Convert with `Airfoil.to_core()` and `AirfoilCore.to_airfoil()`.
+
+    Transforms behave exactly like the `Airfoil` methods of the same name: rotation is clockwise for positive
+    `rotation_deg` and also turns the hinge, and scaling moves holes and the hinge but does not resize them.
+
+    The affine matrix is kept as the six floats `(a, b, c, d, e, f)` of `[[a, b, c], [d, e, f], [0, 0, 1]]`, as
+    composing these in python is much cheaper than numpy operations on tiny arrays; `transform` returns it as an
+    array. `hinge_parameters` holds the hinge's `(angle_deg, rotation_deg, height)` before any transforms, and
+    `rotation_deg` the total rotation added to it since.
+    """
+    __slots__ = (
+        "base_points",
+        "base_hole_centers",
+        "hole_diameters",
+        "base_hinge_position",
+        "hinge_parameters",
+        "affine",
+        "rotation_deg",
+        "_points",
+    )
+
+    def __init__(
+        self,
+        points              : ArrayLike,
+        hole_centers        : ArrayLike|None = None,
+        hole_diameters      : ArrayLike|None = None,
+        hinge_position      : ArrayLike|None = None,
+        hinge_parameters    : ArrayLike|None = None,
+        affine              : tuple[float, float, float, float, float, float] = (1, 0, 0, 0, 1, 0),
+        rotation_deg        : float = 0,
+    ):
+        self.base_points         = np.asarray(points, dtype=float)
+        self.base_hole_centers   = np.zeros((0, 2)) if hole_centers   is None else np.asarray(hole_centers, dtype=float).reshape(-1, 2)
+        self.hole_diameters      = np.zeros(0)      if hole_diameters is None else np.asarray(hole_diameters, dtype=float).reshape(-1)
+        self.base_hinge_position = None if hinge_position is None else np.asarray(hinge_position, dtype=float)
+        self.hinge_parameters    = None if hinge_parameters is None else np.asarray(hinge_parameters, dtype=float)
+        self.affine              = affine
+        self.rotation_deg        = rotation_deg
+        self._points             = None
+
+    def __repr__(self) -> str:
+        return f"<AirfoilCore p={len(self.base_points)} h={len(self.hole_diameters)} />"
+
+    @property
+    def transform(self) -> np.ndarray:
+        """The 3x3 affine matrix applied to column vectors `(x, y, 1)`"""
+        return np.array([*self.affine, 0, 0, 1], dtype=float).reshape(3, 3)
+
+    def _apply(self, points:np.ndarray) -> np.ndarray:
+        a, b, c, d, e, f = self.affine
+        return points @ np.array([[a, d], [b, e]]) + np.array([c, f])
+
+    def _with_transform(self, a:float, b:float, c:float, d:float, e:float, f:float, rotation_deg:float=0) -> AirfoilCore:
+        """Apply `[[a, b, c], [d, e, f], [0, 0, 1]]` after the current transform"""
+        A, B, C, D, E, F = self.affine
+        result = AirfoilCore.__new__(AirfoilCore)
+        result.base_points         = self.base_points
+        result.base_hole_centers   = self.base_hole_centers
+        result.hole_diameters      = self.hole_diameters
+        result.base_hinge_position = self.base_hinge_position
+        result.hinge_parameters    = self.hinge_parameters
+        result.affine              = (a*A + b*D, a*B + b*E, a*C + b*F + c, d*A + e*D, d*B + e*E, d*C + e*F + f)
+        result.rotation_deg        = self.rotation_deg + rotation_deg
+        result._points             = None
+        return result
+
+    @property
+    def points(self) -> np.ndarray:
+        if self._points is None:
+            self._points = self._apply(self.base_points)
+        return self._points
+
+    @property
+    def hole_centers(self) -> np.ndarray:
+        if len(self.base_hole_centers) == 0:
+            return self.base_hole_centers
+        return self._apply(self.base_hole_centers)
+
+    @property
+    def hinge_position(self) -> np.ndarray|None:
+        return None if self.base_hinge_position is None else self._apply(self.base_hinge_position)
+
+    def compute_chord(self) -> float:
+        """Same as `Airfoil.compute_chord`, without applying the transform to the y coordinates"""
+        if self._points is not None:
+            x = self._points[:, 0]
+        else:
+            # the translation does not change the chord
+            x = self.base_points @ np.array(self.affine[:2])
+        return x.max()-x.min()
+
+    def with_translation(self, translation:ArrayLike) -> AirfoilCore:
+        translation = np.asarray(translation, dtype=float)
+        assert translation.shape==(2,), "Translation must be an ndarray of shape (2,)"
+        x, y = translation.tolist()
+        return self._with_transform(1, 0, x, 0, 1, y)
+
+    def with_rotation(self, rotation_deg:float) -> AirfoilCore:
+        rotation_rad = math.radians(rotation_deg)
+        cos, sin = math.cos(rotation_rad), math.sin(rotation_rad)
+        # `Airfoil.with_rotation` multiplies row vectors by the rotation matrix, so columns use its transpose
+        return self._with_transform(cos, sin, 0, -sin, cos, 0, rotation_deg)
+
+    def with_scale(self, scale:ArrayLike) -> AirfoilCore:
+        scale = np.asarray(scale, dtype=float)
+        assert scale.shape==(2,), "Scale must be an ndarray of shape (2,)"
+        x, y = scale.tolist()
+        return self._with_transform(x, 0, 0, 0, y, 0)
+
+    def with_chord(self, new_chord:float) -> AirfoilCore:
+        return self.with_scale([new_chord/self.compute_chord()]*2)
+
+    @classmethod
+    def from_airfoil(cls, airfoil:Airfoil) -> AirfoilCore:
+        hinge = airfoil.hinge
+        return cls(
+            points           = airfoil.points,
+            hole_centers     = [hole.position for hole in airfoil.holes],
+            hole_diameters   = [hole.diameter_mm for hole in airfoil.holes],
+            hinge_position   = None if hinge is None else hinge.position,
+            hinge_parameters = None if hinge is None else (hinge.angle_deg, hinge.rotation_deg, hinge.height),
+        )
+
+    def to_airfoil(self) -> Airfoil:
+        """Apply the transform and wrap the result in an `Airfoil`. The arrays were validated when this core was made
+        from an `Airfoil`, so pydantic validation is skipped."""
+        from ._airfoil import Airfoil, Hole, Hinge
+        hinge = None
+        if self.hinge_parameters is not None:
+            angle_deg, rotation_deg, height = self.hinge_parameters.tolist()
+            hinge = Hinge.model_construct(
+                position     = self.hinge_position,
+                angle_deg    = angle_deg,
+                rotation_deg = rotation_deg + self.rotation_deg,
+                height       = height,
+            )
+        holes = []
+        if len(self.hole_diameters):
+            holes = [
+                Hole.model_construct(diameter_mm=diameter_mm, position=position)
+                for diameter_mm, position in zip(self.hole_diameters.tolist(), self.hole_centers)
+            ]
+        return Airfoil.model_construct(
+            points = self.points,
+            holes  = holes,
+            hinge  = hinge,
+        )
@@ -1,3 +1,27 @@
-from ._serial import CNC
+from ._status import MachineStatus, parse_status
+from ._telemetry import StreamTelemetry, TelemetrySummary, load_telemetry, summarise_telemetry
 from ._gcode_builder import GCodeBuilder
-from ._machine_setup import MachineSetup
\ No newline at end of file
+from ._motion_planning import MachineLimits, plan_feedrate
+from ._gcode_simulator import GCodeSimulation, simulate_gcode
+from ._machine_setup import MachineSetup, CutPlan
+from ._cut_job import CutJob
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from ._serial import CNC, StreamResult
+    from ._async_serial import AsyncCNC
+
+# the serial clients need pyserial (the `machine` extra), so they are only loaded when first used
+_LAZY_IMPORTS = {
+    "CNC"          : "._serial",
+    "StreamResult" : "._serial",
+    "AsyncCNC"     : "._async_serial",
+}
+
+def __getattr__(name:str):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,318 @@
+from __future__ import annotations
+from collections import deque
+from typing import Iterable
+import asyncio
+
+import serial
+from serial import Serial
+
+from ._serial import StreamResult
+from ._status import MachineStatus, is_status_report, parse_status
+from ._telemetry import StreamTelemetry
+
+
+class AsyncCNC:
+    """asyncio client for a GRBL/FluidNC controller using the same `serial_for_url` transports as `CNC`.
+
+    A single reader task demultiplexes everything the controller sends:
+    - `ok` / `error:` acknowledge the oldest line sent, resolving the future returned by `enqueue`
+    - `<...>` status reports update `status` and wake anything awaiting `next_status()`
+    - `ALARM:` lines are stored in `alarm` until `alarm_clear()` succeeds, and resolve every line still awaiting a
+      response
+    - anything else is appended to `messages`
+
+    While `telemetry` is set, every line written, acknowledgement and status report is recorded to it.
+
+    A writer task sends queued lines using GRBL's character counting protocol, so the controller's receive buffer
+    (`rx_buffer_size` bytes) is kept full without overflowing it. If `status_interval` is not `None` a `?` status
+    request is sent every `status_interval` seconds, which does not use receive buffer space or delay the stream.
+
+    Waiting for a response or status report gives up after `timeout_seconds`: `send`, `next_status` and
+    `request_status` raise `TimeoutError`, and `stream` fails as `CNC.stream_gcode_lines` does.
+
+    ```python
+    async with AsyncCNC("socket://fluidnc.local:23") as cnc:
+        result = await cnc.stream(lines)
+        print(cnc.status.machine_position)
+    ```
+    """
+    serial:Serial
+
+    def __init__(
+            self,
+            addr:str="socket://fluidnc.local:23",
+            rx_buffer_size:int=128,
+            status_interval:float|None=0.2,
+            timeout_seconds:float=20,
+        ):
+        self.serial          = serial.serial_for_url(addr, timeout=0.05)
+        self.rx_buffer_size  = rx_buffer_size
+        self.status_interval = status_interval
+        self.timeout_seconds = timeout_seconds
+        self.status:MachineStatus|None = None
+        self.alarm:str|None            = None
+        self.messages:list[str]        = []
+        self.telemetry:StreamTelemetry|None = None
+        self._send_queue:asyncio.Queue[tuple[bytes, asyncio.Future[str]]] = asyncio.Queue()
+        self._in_flight:deque[tuple[int, asyncio.Future[str]]]            = deque()
+        self._in_flight_bytes = 0
+        self._capacity        = asyncio.Condition()
+        self._status_waiters:list[asyncio.Future[MachineStatus]] = []
+        self._writing:asyncio.Future[str]|None = None
+        self._tasks:list[asyncio.Task] = []
+        self._closing = False
+
+    async def __aenter__(self) -> AsyncCNC:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_):
+        await self.close()
+
+    async def start(self):
+        self._closing = False
+        self._tasks = [
+            asyncio.create_task(self._reader()),
+            asyncio.create_task(self._writer()),
+        ]
+        if self.status_interval is not None:
+            self._tasks.append(asyncio.create_task(self._poll_status()))
+
+    async def close(self):
+        self._closing = True
+        reader, *others = self._tasks
+        for task in others:
+            task.cancel()
+        # the reader is left to finish its current read so the port is not closed underneath it
+        await asyncio.gather(reader, *others, return_exceptions=True)
+        for _, future in self._in_flight:
+            if not future.done():
+                future.cancel()
+        self._cancel_queued()
+        self.serial.close()
+
+    def realtime(self, command:bytes):
+        """Send a real-time command (e.g. `b"?"`, `b"!"` feed hold, `b"~"` resume, `b"\\x18"` soft reset).
+        These bypass the queue and the receive buffer accounting."""
+        self.serial.write(command)
+
+    def enqueue(self, line:str) -> asyncio.Future[str]:
+        """Queue a line to be sent. The returned future resolves to its `ok` or `error:` response.
+        Lines should not be terminated with `"\\r\\n"` as this will be automatically added."""
+        command = (line+"\r\n").encode("ascii")
+        if len(command) > self.rx_buffer_size:
+            raise ValueError(f"Line is longer than rx_buffer_size={self.rx_buffer_size}: {line}")
+        future = asyncio.get_running_loop().create_future()
+        self._send_queue.put_nowait((command, future))
+        return future
+
+    async def send(self, line:str, timeout_seconds:float|None=None) -> str:
+        """Queue a line and wait for its response. Raises `TimeoutError` if none arrives within `timeout_seconds`
+        (default `self.timeout_seconds`); the line stays queued, so it is still sent if the controller recovers."""
+        return await asyncio.wait_for(asyncio.shield(self.enqueue(line)), self._timeout(timeout_seconds))
+
+    async def alarm_clear(self) -> str:
+        """Send `$X` to unlock the controller after an alarm, clearing `alarm` if it is acknowledged with `ok`"""
+        response = await self.send("$X")
+        if response == "ok":
+            self.alarm = None
+        return response
+
+    async def next_status(self, timeout_seconds:float|None=None) -> MachineStatus:
+        """Wait for the next status report. Raises `TimeoutError` after `timeout_seconds` (default
+        `self.timeout_seconds`)"""
+        future = asyncio.get_running_loop().create_future()
+        self._status_waiters.append(future)
+        return await asyncio.wait_for(future, self._timeout(timeout_seconds))
+
+    async def request_status(self, timeout_seconds:float|None=None) -> MachineStatus:
+        """Send `?` and wait for the resulting status report, see `next_status`"""
+        future = asyncio.ensure_future(self.next_status(timeout_seconds))
+        self.realtime(b"?")
+        return await future
+
+    def _timeout(self, timeout_seconds:float|None) -> float:
+        return self.timeout_seconds if timeout_seconds is None else timeout_seconds
+
+    async def stream(
+            self,
+            gcode:Iterable[str],
+            stop_on_error:bool=True,
+            max_queued:int=32,
+            telemetry:StreamTelemetry|None=None,
+            timeout_seconds:float|None=None,
+        ) -> StreamResult:
+        """Send many lines, keeping at most `max_queued` lines queued or awaiting a response at once.
+        This only needs to exceed the number of lines that fit in the controller's receive buffer; keeping it small
+        means fewer lines are already queued when an error is noticed.
+
+        Like `CNC.stream_gcode_lines`, on an error (if `stop_on_error`) or alarm no further lines are sent and
+        `M3 S0` is sent to switch off the wire, once every line already sent has been answered. If no response
+        arrives within `timeout_seconds` (default `self.timeout_seconds`) the stream fails the same way, giving up on
+        the lines still awaiting a response so `M3 S0` is written straight away, and waits at most `timeout_seconds`
+        again for it to be acknowledged.
+        While `alarm` is set (see `alarm_clear`) the stream fails at its first line.
+
+        If `telemetry` is given it is used as `self.telemetry` for the duration of the stream, then closed."""
+        if telemetry is not None:
+            self.telemetry = telemetry
+        try:
+            return await self._stream(gcode, stop_on_error, max_queued, self._timeout(timeout_seconds))
+        finally:
+            if telemetry is not None:
+                self.telemetry = None
+                telemetry.close()
+
+    async def _stream(self, gcode:Iterable[str], stop_on_error:bool, max_queued:int, timeout_seconds:float) -> StreamResult:
+        result = StreamResult()
+        log = []
+        pending:deque[tuple[int, str, asyncio.Future[str]]] = deque()
+
+        def collect(wait_for_all:bool):
+            while pending and (pending[0][2].done() or wait_for_all):
+                if not pending[0][2].done():
+                    return
+                line_index, line, future = pending.popleft()
+                if future.cancelled():
+                    continue
+                response = future.result()
+                log.append(f"{line}\r\n{response}\r\n")
+                if response == "ok":
+                    result.ok_count += 1
+                else:
+                    result.errors.append((line_index, response))
+                    if stop_on_error:
+                        result.success = False
+
+        async def wait_for_oldest() -> bool:
+            """Wait for the oldest pending line's response, then collect it. On timeout fail the stream, drop
+            anything not yet written to the controller, give up on the lines awaiting a response (so `M3 S0` can be
+            written straight away, as `CNC.stream_gcode_lines` does) and return False"""
+            done, _ = await asyncio.wait([pending[0][2]], timeout=timeout_seconds)
+            if not done:
+                log.append("TIMEOUT\r\n")
+                result.success = False
+                self._cancel_queued()
+                await self._abandon_in_flight()
+                return False
+            collect(wait_for_all=False)
+            return True
+
+        for line_index, line in enumerate(gcode):
+            collect(wait_for_all=False)
+            if self.alarm is not None:
+                result.errors.append((line_index, self.alarm))
+                result.success = False
+            if not result.success:
+                break
+            while result.success and len(pending) >= max_queued and await wait_for_oldest():
+                pass
+            if not result.success:
+                break
+            pending.append((line_index, line, self.enqueue(line)))
+
+        # the last lines may still fail, so wait for every response before deciding whether to switch off the wire
+        while pending:
+            if not result.success:
+                # drop anything not yet written to the controller
+                self._cancel_queued()
+            if not await wait_for_oldest():
+                break
+        if self.alarm is not None:
+            result.success = False
+        if not result.success:
+            log.append("FAILED\r\n")
+            try:
+                await self.send("M3 S0", timeout_seconds)
+            except TimeoutError:
+                log.append("M3 S0 TIMEOUT\r\n")
+        result.log = "".join(log)
+        return result
+
+    async def _abandon_in_flight(self):
+        """Cancel every line awaiting a response and free the receive buffer space counted for them"""
+        in_flight, self._in_flight = self._in_flight, deque()
+        async with self._capacity:
+            self._in_flight_bytes = 0
+            self._capacity.notify_all()
+        for _, future in in_flight:
+            if not future.done():
+                future.cancel()
+
+    def _cancel_queued(self):
+        """Cancel every line that has not been written to the controller yet"""
+        if self._writing is not None:
+            self._writing.cancel()
+        while not self._send_queue.empty():
+            self._send_queue.get_nowait()[1].cancel()
+
+    async def _reader(self):
+        received = b""
+        while not self._closing:
+            received += await asyncio.to_thread(self.serial.read, max(1, self.serial.in_waiting))
+            *lines, received = received.split(b"\n")
+            for raw_line in lines:
+                await self._handle_line(raw_line.decode("ascii", errors="replace").strip())
+
+    async def _handle_line(self, line:str):
+        if line == "":
+            return
+        if line == "ok" or line.startswith("error"):
+            if not self._in_flight:
+                self.messages.append(line)
+                return
+            line_bytes, future = self._in_flight.popleft()
+            async with self._capacity:
+                self._in_flight_bytes -= line_bytes
+                self._capacity.notify_all()
+            if self.telemetry is not None:
+                self.telemetry.record_ack(future, line)
+            if not future.done():
+                future.set_result(line)
+        elif is_status_report(line):
+            self.status = parse_status(line)
+            if self.telemetry is not None:
+                self.telemetry.record_status(self.status)
+            waiters, self._status_waiters = self._status_waiters, []
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(self.status)
+        elif line.startswith("ALARM"):
+            # the controller discards its receive buffer on alarm, so nothing in flight will be acknowledged
+            self.alarm = line
+            self.messages.append(line)
+            in_flight, self._in_flight = self._in_flight, deque()
+            async with self._capacity:
+                self._in_flight_bytes = 0
+                self._capacity.notify_all()
+            for _, future in in_flight:
+                if self.telemetry is not None:
+                    self.telemetry.record_ack(future, line)
+                if not future.done():
+                    future.set_result(line)
+        else:
+            self.messages.append(line)
+
+    async def _writer(self):
+        while True:
+            command, future = await self._send_queue.get()
+            if future.cancelled():
+                continue
+            self._writing = future
+            async with self._capacity:
+                await self._capacity.wait_for(
+                    lambda: not self._in_flight or self._in_flight_bytes + len(command) <= self.rx_buffer_size
+                )
+                self._writing = None
+                if future.cancelled():
+                    continue
+                self.serial.write(command)
+                if self.telemetry is not None:
+                    self.telemetry.record_send(future)
+                self._in_flight.append((len(command), future))
+                self._in_flight_bytes += len(command)
+
+    async def _poll_status(self):
+        while True:
+            self.realtime(b"?")
+            await asyncio.sleep(self.status_interval)
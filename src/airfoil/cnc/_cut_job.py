@@ -0,0 +1,117 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from ._gcode_builder import GCodeBuilder as gcb
+from ._machine_setup import MachineSetup, CutPlan
+
+from .._airfoil import Airfoil
+from .._WingSegment import WingSegment
+
+
+class CutJob(BaseModel):
+    """Several parts cut from one foam block in a single G-code program.
+
+    Parts are nested in a row along the depth of the block, `part_spacing` apart and centered on the block's height,
+    in the order given. Each part is entered with a vertical kerf from above its first point (the top right of the
+    profile, where `Decomposer` starts the outline) and left the same way, so no part is cut through while reaching
+    another. Parts are cut front to back, which keeps travel across the top of the block to the length of the row.
+
+    An `Airfoil` part is cut as a rib of constant profile through the full `foam_width`.
+
+    ```python
+    job = CutJob(parts=ribs, foam_width=10, foam_depth=600, foam_height=60, plane_spacing=400)
+    lines = job.prepare_gcode(parallel=True)
+    ```
+    """
+    parts            : list[WingSegment|Airfoil]
+    foam_width       : float
+    """Width of the block along the wire. Only used for `Airfoil` parts; a `WingSegment` is cut at its own length"""
+    foam_depth       : float
+    foam_height      : float
+    plane_spacing    : float
+    part_spacing     : float          = 10
+    """Gap between neighbouring parts' bounding boxes, and before the first part"""
+    travel_clearance : float          = 20
+    """Height above the block at which the wire travels between parts"""
+    setup_options    : dict[str, Any] = Field(default_factory=dict)
+    """Other `MachineSetup` fields applied to every part, e.g. `{"max_cut_speed_mm_s": 150}`"""
+
+    def setups(self) -> list[MachineSetup]:
+        """A `MachineSetup` for each part, placed in the block, in cut order"""
+        segments = [
+            WingSegment(left=part, right=part, length=self.foam_width) if isinstance(part, Airfoil) else part
+            for part in self.parts
+        ]
+        depths = np.array([segment.bounding_size()[0] for segment in segments])
+        minimum_y = np.cumsum(np.concatenate([[0], depths[:-1]])) + self.part_spacing*np.arange(1, len(segments)+1)
+        required_depth = minimum_y[-1] + depths[-1] + self.part_spacing if len(segments) else 0
+        if required_depth > self.foam_depth:
+            raise ValueError(f"Parts need a foam_depth of at least {required_depth:.1f}. Got: {self.foam_depth}")
+
+        setups = []
+        for segment, y in zip(segments, minimum_y + depths/2):
+            placed = segment.with_translation(np.array([y, self.foam_height/2]) - segment.bounding_center()[1:])
+            setups.append(MachineSetup(
+                wing_segment  = placed,
+                foam_depth    = self.foam_depth,
+                foam_height   = self.foam_height,
+                plane_spacing = self.plane_spacing,
+                **self.setup_options,
+            ))
+        return setups
+
+    def cut_plans(self, parallel:bool=False, max_workers:int|None=None) -> list[CutPlan]:
+        """The `CutPlan` of each part in cut order.
+
+        `parallel=True` plans the parts in a process pool with `max_workers` processes (default: one per CPU). The
+        result is the same as when planning in series."""
+        setups = self.setups()
+        if not parallel:
+            return [setup.cut_plan() for setup in setups]
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(MachineSetup.cut_plan, setups))
+
+    def prepare_gcode(self, parallel:bool=False, max_workers:int|None=None) -> list[str]:
+        """One program cutting every part, see `cut_plans` for `parallel` and `max_workers`"""
+        plans = self.cut_plans(parallel=parallel, max_workers=max_workers)
+        options = MachineSetup.model_fields
+        travel_speed   = self.setup_options.get("travel_speed",       options["travel_speed"].default)
+        plunge_speed   = self.setup_options.get("max_cut_speed_mm_s", options["max_cut_speed_mm_s"].default)
+        current        = self.setup_options.get("cut_current_amps",   options["cut_current_amps"].default)
+        arc_tolerance  = self.setup_options.get("arc_tolerance",      options["arc_tolerance"].default)
+        travel_height  = self.foam_height + self.travel_clearance
+
+        # leave the home position the same way `MachineSetup.prepare_gcode` does
+        start = np.tile(np.array([
+            [ 0, self.foam_height ],
+            [-5, self.foam_height ],
+            [-5, travel_height    ],
+        ]), (1, 2))
+        xyza     = [start]
+        feedrate = [np.full(len(start)-1, travel_speed)]
+        for plan in plans:
+            above = plan.xyza[0].copy()
+            above[[1, 3]] = travel_height
+            xyza    .extend([[above], plan.xyza, [above]])
+            feedrate.extend([[travel_speed, plunge_speed], plan.feedrate, [plunge_speed]])
+        finish = np.full((1, 4), travel_height)
+        finish[0, [0, 2]] = self.foam_depth + 5
+        xyza    .append(finish)
+        feedrate.append([travel_speed])
+
+        result = (
+            gcb()
+            .absolute()
+            .set_current(current)
+            .path_absolute(
+                xyza          = np.concat(xyza),
+                feedrate      = np.concat(feedrate),
+                arc_tolerance = arc_tolerance,
+            )
+            .set_current(0)
+        )
+        return result.lines
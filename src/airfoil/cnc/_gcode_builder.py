@@ -1,23 +1,67 @@
 from __future__ import annotations
-from typing import Callable, Iterable
-from dataclasses import dataclass, field
+from typing import Callable, Generator, Iterable
 from itertools import pairwise
 import numpy as np
 
 
-@dataclass
 class GCodeBuilder:
-    
-    lines:list[str] = field(default_factory=list)
+    """Fluent, immutable-looking builder for lists of G-code lines.
+
+    Every method returns a new `GCodeBuilder`, but builders share one append-only buffer. Appending to the most
+    recent builder is O(1); appending to an older builder copies the lines it can see into a new buffer first, so
+    earlier builders are never affected by later ones.
+    """
+
+    def __init__(self, lines:Iterable[str]=()):
+        self._buffer:list[str] = list(lines)
+        self._length:int       = len(self._buffer)
+
+    @property
+    def lines(self) -> list[str]:
+        return self._buffer[:self._length]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self):
+        return iter(self._buffer[:self._length])
+
+    def __repr__(self) -> str:
+        return f"GCodeBuilder(lines={self.lines!r})"
+
+    def __eq__(self, other:object) -> bool:
+        if not isinstance(other, GCodeBuilder):
+            return NotImplemented
+        return self.lines == other.lines
+
+    def _writable_buffer(self) -> list[str]:
+        """The shared buffer if this builder is at its tip, otherwise a private copy of this builder's lines"""
+        if self._length == len(self._buffer):
+            return self._buffer
+        return self._buffer[:self._length]
+
+    def _view(self, buffer:list[str]) -> GCodeBuilder:
+        result = GCodeBuilder.__new__(GCodeBuilder)
+        result._buffer = buffer
+        result._length = len(buffer)
+        return result
 
     def extend(self, other:GCodeBuilder):
-        return GCodeBuilder(lines=[*self.lines,*other.lines])
+        return self.extend_lines(other.lines)
+
+    def extend_lines(self, lines:Iterable[str]) -> GCodeBuilder:
+        buffer = self._writable_buffer()
+        buffer.extend(lines)
+        return self._view(buffer)
+
     def append(self, line:str)->GCodeBuilder:
-        return GCodeBuilder(lines=[*self.lines, line])
+        buffer = self._writable_buffer()
+        buffer.append(line)
+        return self._view(buffer)
         
     
     def extend_many(self, others:Iterable[GCodeBuilder]):
-        result = GCodeBuilder(lines=[*self.lines])
+        result = self
         for other in others:
             result = result.extend(other)
         return result
@@ -29,7 +73,7 @@ class GCodeBuilder:
     
     def travel(self, x:float, y:float, z:float, a:float) -> GCodeBuilder:
         """`G0`"""
-        return self.append(f"G0 X{x:.2f} Y{y:.2f} Z{z:.2f} A{a:.2f}")
+        return self.append(_travel(x, y, z, a))
     
     def absolute(self) -> GCodeBuilder:
         """`G90`"""
@@ -45,7 +89,7 @@ class GCodeBuilder:
 
         NOTE: Feedrate is not compensated for 4 axis movement. this specifies the speed in 4D space.
         """
-        return self.append(f"G1 F{feed_rate:.2f} X{x:.2f} Y{y:.2f} Z{z:.2f} A{a:.2f}")
+        return self.append(_linear_move_with_feedrate(feed_rate, x, y, z, a))
     
     def set_feedrate(self, feed_rate:float) -> GCodeBuilder:
         """
@@ -59,7 +103,7 @@ class GCodeBuilder:
         """
         `G1 X# Y# Z# A#`
         """
-        return self.append(f"G1 X{x:.2f} Y{y:.2f} Z{z:.2f} A{a:.2f}")
+        return self.append(_linear_move(x, y, z, a))
     
     def set_position(self, x:float, y:float, z:float, a:float) -> GCodeBuilder:
         """`G92`
@@ -85,14 +129,7 @@ class GCodeBuilder:
     def set_current(self, current:float) -> GCodeBuilder:
         """`M3 S???`
         current should be between 0.0 and 4.0 Amps"""
-        MAX = 4
-        MIN = 0
-        if current<=MIN:
-            return self.append("M3 S5")
-        else:
-            portion = (current-MIN)/(MAX-MIN)
-            pwm_percent = (portion*0.8+0.1)*100
-            return self.append(f"M3 S{pwm_percent:.1f}")
+        return self.append(_set_current(current))
     
     def wrap_zero_current(self, block:Callable[[GCodeBuilder],GCodeBuilder]) -> GCodeBuilder:
         result = self.set_current(0)
@@ -130,14 +167,47 @@ class GCodeBuilder:
             xyza     : np.ndarray,
             feedrate : np.ndarray,
             current  : np.ndarray|None=None,
-            compensate_feedrate:bool = False
+            compensate_feedrate:bool = False,
+            arc_tolerance:float|None = None,
         ):
+        """Move through each point in `xyza`, using `feedrate[i]` and `current[i]` for the move ending at `xyza[i+1]`.
+
+        If `arc_tolerance` is given, runs of moves are replaced with a single `G2`/`G3` arc wherever the controller
+        would reproduce both toolheads' paths to within `arc_tolerance` mm. GRBL interpolates an arc in the XY plane
+        and moves Z and A linearly alongside it, so this applies where the XY toolhead follows a circle and the ZA
+        toolhead moves in proportion to the arc angle. Where both toolheads follow circles (e.g. the same hole on
+        each side) this is not possible, and `G1` moves are used.
+        """
+        if arc_tolerance is not None:
+            return self.extend_lines(_path_absolute_arcs(
+                xyza                = xyza,
+                feedrate            = feedrate,
+                current             = current,
+                compensate_feedrate = compensate_feedrate,
+                tolerance           = arc_tolerance,
+            ))
+        return self.extend_lines(_path_absolute_bulk(
+            xyza                = xyza,
+            feedrate            = feedrate,
+            current             = current,
+            compensate_feedrate = compensate_feedrate,
+        ))
+
+    @staticmethod
+    def path_absolute_lines(
+            xyza     : np.ndarray,
+            feedrate : np.ndarray,
+            current  : np.ndarray|None=None,
+            compensate_feedrate:bool = False
+        ) -> Generator[str]:
+        """Lazily yields the same lines that `path_absolute` would add to a builder"""
         
         assert len(feedrate)==len(xyza)-1, "Length of `feedrate` must be one less than length of `xyza`"
         if current is not None:
             assert len(current) ==len(xyza)-1, "Length of `current` must be one less than length of `xyza`"
         
-        result:GCodeBuilder = self.absolute().travel(*xyza[0])
+        yield "G90"
+        yield _travel(*xyza[0])
         last_feedrate = None
         last_current  = None
 
@@ -160,19 +230,248 @@ class GCodeBuilder:
             if current_current is not None:
                 next_current = np.round(current_current*10)/10
                 if next_current != last_current:
-                    result = result.set_current(next_current)
+                    yield _set_current(next_current)
                     last_current = current_current
             
             if next_feedrate != last_feedrate:
-                result = result.linear_move_with_feedrate(
+                yield _linear_move_with_feedrate(
                     next_feedrate,
                     *current_position
                 )
                 last_feedrate = next_feedrate
             else:
-                result = result.linear_move(*current_position)
-        
-        return result
+                yield _linear_move(*current_position)
+
+
+def _path_absolute_bulk(
+        xyza     : np.ndarray,
+        feedrate : np.ndarray,
+        current  : np.ndarray|None=None,
+        compensate_feedrate:bool = False
+    ) -> list[str]:
+    """Produces exactly the same lines as `GCodeBuilder.path_absolute_lines`, but computes feedrates, change
+    detection and text formatting over whole arrays at once"""
+    assert len(feedrate)==len(xyza)-1, "Length of `feedrate` must be one less than length of `xyza`"
+    if current is not None:
+        assert len(current) ==len(xyza)-1, "Length of `current` must be one less than length of `xyza`"
+    
+    xyza      = np.asarray(xyza, dtype=float)
+    feedrate  = np.asarray(feedrate, dtype=float)
+    positions = xyza[1:]
+    moves     = len(positions)
+
+    if compensate_feedrate:
+        next_feedrate = np.round(feedrate * _compensate_feedrate(*np.diff(xyza, axis=0).transpose())*2)/2
+    else:
+        next_feedrate = np.round(feedrate*2)/2
+    feedrate_changed = np.ones(moves, dtype=bool)
+    feedrate_changed[1:] = next_feedrate[1:] != next_feedrate[:-1]
+
+    move_lines = np.empty(moves, dtype=object)
+    move_lines[feedrate_changed] = _format_rows(
+        "G1 F%.2f X%.2f Y%.2f Z%.2f A%.2f",
+        np.column_stack([next_feedrate, positions])[feedrate_changed],
+    )
+    move_lines[~feedrate_changed] = _format_rows(
+        "G1 X%.2f Y%.2f Z%.2f A%.2f",
+        positions[~feedrate_changed],
+    )
+
+    if current is None:
+        return ["G90", _travel(*xyza[0]), *move_lines.tolist()]
+
+    # The scalar version compares each rounded current against the *unrounded* current of the last `M3` it emitted.
+    # Within a run of equal rounded values this means every line emits an `M3` until (and including) the first one
+    # whose unrounded current is already round; the rest of the run is then silent.
+    current = np.asarray(current, dtype=float)
+    next_current = np.round(current*10)/10
+    run_start = np.ones(moves, dtype=bool)
+    run_start[1:] = next_current[1:] != next_current[:-1]
+    run_start_index = np.maximum.accumulate(np.where(run_start, np.arange(moves), 0))
+    rounds_up_to = np.cumsum(current == next_current) - (current == next_current)
+    current_changed = rounds_up_to == rounds_up_to[run_start_index]
+
+    lines = np.empty(moves + current_changed.sum(), dtype=object)
+    move_index = np.arange(moves) + np.cumsum(current_changed)
+    lines[move_index] = move_lines
+    lines[move_index[current_changed]-1] = _set_current_many(next_current[current_changed])
+    return ["G90", _travel(*xyza[0]), *lines.tolist()]
+
+def _path_absolute_arcs(
+        xyza     : np.ndarray,
+        feedrate : np.ndarray,
+        current  : np.ndarray|None,
+        compensate_feedrate:bool,
+        tolerance:float,
+    ) -> list[str]:
+    """`path_absolute` with runs of moves replaced by arcs where possible, see `GCodeBuilder.path_absolute`.
+    Moves that are not part of an arc produce the same lines as `_path_absolute_bulk`."""
+    assert len(feedrate)==len(xyza)-1, "Length of `feedrate` must be one less than length of `xyza`"
+    if current is not None:
+        assert len(current) ==len(xyza)-1, "Length of `current` must be one less than length of `xyza`"
+    xyza = np.asarray(xyza, dtype=float)
+    feedrate = np.asarray(feedrate, dtype=float)
+    if compensate_feedrate:
+        feedrate = feedrate * _compensate_feedrate(*np.diff(xyza, axis=0).transpose())
+    rounded_current = None if current is None else np.round(np.asarray(current, dtype=float)*10)/10
+
+    # an arc must not span a change of current, as there is nowhere to put the M3
+    if rounded_current is not None:
+        breaks = np.flatnonzero(np.concatenate([[True], rounded_current[1:]!=rounded_current[:-1], [True]]))
+    else:
+        breaks = np.array([0, len(xyza)-1])
+    arcs = {
+        start: (end, center, counter_clockwise)
+        for range_start, range_end in pairwise(breaks.tolist())
+        for start, end, center, counter_clockwise in _fit_arcs(xyza[range_start:range_end+1], tolerance, offset=range_start)
+    }
+
+    lines = ["G90", _travel(*xyza[0])]
+    last_feedrate = None
+    last_current  = None
+    index = 0
+    while index < len(xyza)-1:
+        end, center, counter_clockwise = arcs.get(index, (index+1, None, False))
+        next_feedrate = np.round(feedrate[index:end].min()*2)/2
+        if current is not None:
+            # same rule as `path_absolute_lines`, see `_path_absolute_bulk`
+            if rounded_current[index] != last_current:
+                lines.append(_set_current(rounded_current[index]))
+                last_current = current[index]
+        feed = f"F{next_feedrate:.2f} " if next_feedrate != last_feedrate else ""
+        last_feedrate = next_feedrate
+        x, y, z, a = xyza[end]
+        if center is None:
+            lines.append(f"G1 {feed}X{x:.2f} Y{y:.2f} Z{z:.2f} A{a:.2f}")
+        else:
+            i, j = _arc_offset(xyza[index, :2], xyza[end, :2], center)
+            lines.append(f"{'G3' if counter_clockwise else 'G2'} {feed}X{x:.2f} Y{y:.2f} Z{z:.2f} A{a:.2f} I{i:.4f} J{j:.4f}")
+        index = end
+    return lines
+
+def _fit_arcs(
+        xyza:np.ndarray,
+        tolerance:float,
+        offset:int=0,
+        min_moves:int=3,
+    ) -> list[tuple[int, int, np.ndarray, bool]]:
+    """Greedily find runs of at least `min_moves` moves that a single XY arc reproduces within `tolerance`.
+    Returns `(start index, end index, xy center, counter clockwise)` for each, with indexes shifted by `offset`."""
+    arcs = []
+    start = 0
+    last = len(xyza)-1
+    while start <= last-min_moves:
+        if _arc_through(xyza, start, start+min_moves, tolerance) is None:
+            start += 1
+            continue
+        # grow the run exponentially then binary search for the longest run that still fits
+        good, step = start+min_moves, 1
+        while good+step <= last and _arc_through(xyza, start, good+step, tolerance) is not None:
+            good += step
+            step *= 2
+        bad = min(good+step, last+1)
+        while bad-good > 1:
+            middle = (good+bad)//2
+            if _arc_through(xyza, start, middle, tolerance) is not None:
+                good = middle
+            else:
+                bad = middle
+        center, counter_clockwise = _arc_through(xyza, start, good, tolerance)
+        # a run that is straight within tolerance is better left as G1 moves
+        chord = xyza[good, :2] - xyza[start, :2]
+        straight = np.abs(_cross(chord, xyza[start:good+1, :2] - xyza[start, :2])).max() <= tolerance*np.linalg.norm(chord)
+        i, j = _arc_offset(xyza[start, :2], xyza[good, :2], center)
+        moved = np.linalg.norm(np.round(xyza[start, :2], 2) + (i, j) - center)
+        if not straight and moved <= tolerance:
+            arcs.append((start+offset, good+offset, center, counter_clockwise))
+        start = good
+    return arcs
+
+def _arc_through(xyza:np.ndarray, start:int, end:int, tolerance:float) -> tuple[np.ndarray, bool]|None:
+    """The XY center and direction of an arc from `xyza[start]` to `xyza[end]` that reproduces every point between
+    within `tolerance`, with ZA interpolated linearly along the arc as GRBL does; `None` if there isn't one."""
+    points = xyza[start:end+1]
+    xy, za = points[:, :2], points[:, 2:]
+    middle = len(points)//2
+    center = _circumcenter(xy[0], xy[middle], xy[-1])
+    if center is None:
+        return None
+    radius = np.linalg.norm(xy - center, axis=1)
+    if np.abs(radius - radius[0]).max() > tolerance:
+        return None
+
+    angle = np.unwrap(np.arctan2(xy[:, 1]-center[1], xy[:, 0]-center[0]))
+    step = np.diff(angle)
+    counter_clockwise = step[0] > 0
+    if not ((step > 0).all() if counter_clockwise else (step < 0).all()):
+        return None
+    # longer arcs have short chords, so rounding their endpoints would move the center too far (see `_arc_offset`)
+    if np.abs(angle[-1]-angle[0]) > np.pi:
+        return None
+    # the arc bulges away from each original straight move by its sagitta
+    if (radius[0]*(1-np.cos(np.abs(step)/2))).max() > tolerance:
+        return None
+    fraction = (angle - angle[0])/(angle[-1] - angle[0])
+    linear_za = za[0] + fraction[:, None]*(za[-1] - za[0])
+    if np.linalg.norm(za - linear_za, axis=1).max() > tolerance:
+        return None
+    return center, bool(counter_clockwise)
+
+def _circumcenter(a:np.ndarray, b:np.ndarray, c:np.ndarray) -> np.ndarray|None:
+    ab, ac = b-a, c-a
+    denominator = 2*_cross(ab, ac)
+    if abs(denominator) < 1e-12:
+        return None
+    ab2, ac2 = ab@ab, ac@ac
+    return a + np.array([ac[1]*ab2 - ab[1]*ac2, ab[0]*ac2 - ac[0]*ab2])/denominator
+
+def _arc_offset(start:np.ndarray, end:np.ndarray, center:np.ndarray) -> tuple[float, float]:
+    """`I`, `J` for an arc between the *rounded* start and end points (as written to the G-code), with the center
+    moved onto their perpendicular bisector so GRBL sees exactly equal start and end radii"""
+    start, end = np.round(start, 2), np.round(end, 2)
+    midpoint = (start+end)/2
+    chord = end-start
+    normal = np.array([-chord[1], chord[0]])/np.linalg.norm(chord)
+    center = midpoint + normal*((center-midpoint)@normal)
+    return tuple(center-start)
+
+def _cross(a:np.ndarray, b:np.ndarray) -> np.ndarray:
+    """z component of the cross product of 2D vectors"""
+    return a[...,0]*b[...,1] - a[...,1]*b[...,0]
+
+def _format_rows(template:str, rows:np.ndarray) -> list[str]:
+    """Apply a %-style `template` to each row of `rows` using a single string formatting operation"""
+    if len(rows)==0:
+        return []
+    return ((template+"\n")*len(rows) % tuple(rows.ravel().tolist())).split("\n")[:-1]
+
+def _set_current_many(current:np.ndarray) -> list[str]:
+    MAX = 4
+    MIN = 0
+    portion = (current-MIN)/(MAX-MIN)
+    pwm_percent = (portion*0.8+0.1)*100
+    lines = np.array(_format_rows("M3 S%.1f", pwm_percent.reshape(-1,1)), dtype=object)
+    lines[current<=MIN] = "M3 S5"
+    return lines.tolist()
+
+def _travel(x:float, y:float, z:float, a:float) -> str:
+    return f"G0 X{x:.2f} Y{y:.2f} Z{z:.2f} A{a:.2f}"
+
+def _linear_move(x:float, y:float, z:float, a:float) -> str:
+    return f"G1 X{x:.2f} Y{y:.2f} Z{z:.2f} A{a:.2f}"
+
+def _linear_move_with_feedrate(feed_rate:float, x:float, y:float, z:float, a:float) -> str:
+    return f"G1 F{feed_rate:.2f} X{x:.2f} Y{y:.2f} Z{z:.2f} A{a:.2f}"
+
+def _set_current(current:float) -> str:
+    MAX = 4
+    MIN = 0
+    if current<=MIN:
+        return "M3 S5"
+    else:
+        portion = (current-MIN)/(MAX-MIN)
+        pwm_percent = (portion*0.8+0.1)*100
+        return f"M3 S{pwm_percent:.1f}"
 
 
 def _compensate_feedrate(dx, dy, dz, da):
@@ -0,0 +1,259 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Iterable
+import re
+
+import numpy as np
+
+from ._motion_planning import (
+    MachineLimits,
+    limit_by_axis_maximum,
+    junction_speed_squared,
+    plan_speeds_squared,
+    trapezoid_profile,
+)
+
+
+@dataclass
+class GCodeSimulation:
+    """Result of `simulate_gcode`. Per-move arrays have one entry per move that actually changes the position."""
+    line_index      : np.ndarray
+    """Index of the G-code line that produced each move"""
+    start           : np.ndarray
+    """(n, 4) XYZA position at the start of each move"""
+    end             : np.ndarray
+    length          : np.ndarray
+    """Length of each move in XYZA space (mm), along the arc for `G2`/`G3`"""
+    rapid           : np.ndarray
+    """True for `G0` moves"""
+    requested_speed : np.ndarray
+    """The programmed feedrate in mm/s (infinite for `G0`)"""
+    nominal_speed   : np.ndarray
+    """`requested_speed` capped by the axis `max_rate_mm_per_min` (mm/s)"""
+    entry_speed     : np.ndarray
+    exit_speed      : np.ndarray
+    peak_speed      : np.ndarray
+    duration        : np.ndarray
+    """Seconds taken by each move"""
+    dwell_seconds   : float
+    """Total time spent in `G4` dwells"""
+
+    @property
+    def total_seconds(self) -> float:
+        return float(self.duration.sum() + self.dwell_seconds)
+
+    @property
+    def average_speed(self) -> np.ndarray:
+        """The actual speed of each move, averaged over its duration (mm/s)"""
+        return np.divide(self.length, self.duration, out=np.zeros_like(self.length), where=self.duration>0)
+
+    @property
+    def rate_limited(self) -> np.ndarray:
+        """Moves where an axis' `max_rate_mm_per_min` is lower than the requested feedrate"""
+        return self.nominal_speed < self.requested_speed
+
+    @property
+    def acceleration_limited(self) -> np.ndarray:
+        """Moves that never reach their nominal speed because of acceleration limits, junction speeds or lookahead"""
+        return self.peak_speed < self.nominal_speed*(1-1e-6)
+
+
+_WORD    = re.compile(rb"([A-Z])\s*([-+]?(?:\d+\.?\d*|\.\d+))|(\n)")
+_COMMENT = re.compile(rb"\([^\n]*?\)|;[^\n]*")
+_NOT_TOKEN = np.ones(256, dtype=bool)
+_NOT_TOKEN[list(b"0123456789.+-ABCDEFGHIJKLMNOPQRSTUVWXYZ\n")] = False
+
+
+def simulate_gcode(
+        gcode:str|Iterable[str],
+        limits:MachineLimits|None=None,
+        spindle_change_stops:bool=True,
+    ) -> GCodeSimulation:
+    """Estimate how a GRBL-style controller would execute `gcode`, either the string from `GCodeBuilder.build()` or
+    a list of lines like `MachineSetup.prepare_gcode()` returns.
+
+    Moves are planned with trapezoidal acceleration limited per-axis by `limits`, junction deviation cornering, and
+    `limits.planner_blocks` moves of lookahead. The machine comes to rest at `G4` dwells, `G92`, `$` commands and,
+    if `spindle_change_stops` (as for FluidNC spindles not in laser mode), at `M3`/`M4`/`M5`.
+
+    ```python
+    simulation = simulate_gcode(machine_setup.prepare_gcode())
+    print(f"{simulation.total_seconds/60:.1f} minutes")
+    ```
+    """
+    limits = limits or MachineLimits()
+    text = gcode if isinstance(gcode, str) else "\n".join(gcode)
+    text = _COMMENT.sub(b"", text.replace("\r", "").upper().encode("ascii", errors="replace"))
+    line_count = text.count(b"\n") + 1
+    line, letter, value, setting_lines = _tokenize(text)
+
+    def per_line(code:str, only:np.ndarray|None=None) -> np.ndarray:
+        """The value of the last `code` word on each line, or NaN"""
+        result = np.full(line_count, np.nan)
+        mask = letter == ord(code)
+        if only is not None:
+            mask &= only
+        result[line[mask]] = value[mask]
+        return result
+
+    def forward_fill(values:np.ndarray, initial:float) -> np.ndarray:
+        index = np.maximum.accumulate(np.where(np.isnan(values), -1, np.arange(len(values))))
+        return np.where(index >= 0, values[index], initial)
+
+    def has_g(code:float) -> np.ndarray:
+        result = np.zeros(line_count, dtype=bool)
+        result[line[(letter == ord("G")) & (value == code)]] = True
+        return result
+
+    motion   = forward_fill(per_line("G", only=np.isin(value, (0, 1, 2, 3))), initial=0)
+    rapid    = motion == 0
+    relative = forward_fill(per_line("G", only=np.isin(value, (90, 91))), initial=90) == 91
+    feed     = forward_fill(per_line("F"), initial=np.nan)
+    dwell    = has_g(4)
+    set_position = has_g(92)
+    axis_words = np.column_stack([per_line(axis) for axis in "XYZA"])
+    has_axis_word = ~np.isnan(axis_words).all(axis=1)
+
+    stop_line = dwell | set_position
+    stop_line[setting_lines] = True
+    if spindle_change_stops:
+        stop_line[line[(letter == ord("M")) & np.isin(value, (3, 4, 5))]] = True
+
+    # Program coordinates after each move or G92. Each is the most recent absolute (or G92) value of that axis plus
+    # any relative moves since, found with running maximums and a cumulative sum rather than a python loop
+    move_line  = np.flatnonzero(has_axis_word & ~dwell & ~set_position)
+    event_line = np.flatnonzero(has_axis_word & ~dwell)
+    words = axis_words[event_line]
+    has_word = ~np.isnan(words)
+    is_relative = relative[event_line][:, None] & ~set_position[event_line][:, None] & has_word
+    is_absolute = has_word & ~is_relative
+    relative_sum = np.cumsum(np.where(is_relative, words, 0), axis=0)
+    last_absolute = np.maximum.accumulate(np.where(is_absolute, np.arange(len(event_line))[:, None], -1), axis=0)
+    columns = np.arange(4)[None, :]
+    positions = relative_sum + np.where(
+        last_absolute >= 0,
+        words[last_absolute, columns] - relative_sum[last_absolute, columns],
+        0,
+    )
+    previous = np.concatenate([np.zeros((1, 4)), positions[:-1]])
+    is_move = ~set_position[event_line]
+    start, end = previous[is_move], positions[is_move]
+
+    # G2/G3 moves follow an arc around I, J in XY while Z and A move linearly
+    length = np.linalg.norm(end - start, axis=1)
+    arc = np.isin(motion[move_line], (2, 3))
+    if arc.any():
+        center = start[arc, :2] + np.nan_to_num(np.column_stack([per_line("I"), per_line("J")])[move_line[arc]])
+        radius = np.linalg.norm(start[arc, :2] - center, axis=1)
+        start_angle = np.arctan2(*(start[arc, :2] - center).T[::-1])
+        end_angle   = np.arctan2(*(end[arc, :2] - center).T[::-1])
+        counter_clockwise = motion[move_line[arc]] == 3
+        sweep = np.where(counter_clockwise, end_angle - start_angle, start_angle - end_angle) % (2*np.pi)
+        sweep[sweep == 0] = 2*np.pi # a full circle
+        length[arc] = np.hypot(radius*sweep, np.linalg.norm(end[arc, 2:] - start[arc, 2:], axis=1))
+
+    return _plan(
+        start         = start,
+        end           = end,
+        length        = length,
+        feed_mm_min   = feed[move_line],
+        rapid         = rapid[move_line],
+        line_index    = move_line,
+        stops         = np.searchsorted(move_line, np.flatnonzero(stop_line), side="left"),
+        limits        = limits,
+        dwell_seconds = float(np.nansum(per_line("P")[dwell])),
+    )
+
+
+def _tokenize(text:bytes) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Split G-code into `(line, letter, value)` arrays with one entry per word, and the indexes of `$` lines.
+
+    Usually every letter is followed by a number, so blanking everything but numbers lets numpy parse all the values
+    in one call. If that does not line up (e.g. `$H` or a malformed word) this falls back to a regular expression.
+    """
+    data = np.frombuffer(text, dtype=np.uint8).copy()
+    newline = data == ord("\n")
+    line_of_byte = np.cumsum(newline) - newline
+    visible = np.flatnonzero((data > ord(" ")) & ~newline)
+    first_lines, first_visible = np.unique(line_of_byte[visible], return_index=True)
+    setting_lines = first_lines[data[visible[first_visible]] == ord("$")]
+    data[np.isin(line_of_byte, setting_lines) & ~newline] = ord(" ")
+    data[_NOT_TOKEN[data]] = ord(" ")
+
+    is_letter = (data >= ord("A")) & (data <= ord("Z"))
+    letter = data[is_letter]
+    line = line_of_byte[is_letter]
+    numbers = data.copy()
+    numbers[is_letter | newline] = ord(" ")
+    try:
+        value = np.array(numbers.tobytes().split(), dtype=float)
+    except ValueError:
+        value = np.zeros(0)
+    if len(value) != len(letter):
+        cleaned = data.tobytes()
+        letters, values, lines = [], [], []
+        current_line = 0
+        for word_letter, word_value, word_newline in _WORD.findall(cleaned):
+            if word_newline:
+                current_line += 1
+                continue
+            letters.append(word_letter[0])
+            values.append(float(word_value))
+            lines.append(current_line)
+        letter = np.array(letters, dtype=np.uint8)
+        value  = np.array(values, dtype=float)
+        line   = np.array(lines, dtype=int)
+    return line, letter, value, setting_lines
+
+
+def _plan(
+        start:np.ndarray,
+        end:np.ndarray,
+        length:np.ndarray,
+        feed_mm_min:np.ndarray,
+        rapid:np.ndarray,
+        line_index:np.ndarray,
+        stops:np.ndarray,
+        limits:MachineLimits,
+        dwell_seconds:float,
+    ) -> GCodeSimulation:
+    delta  = end - start
+    # the controller drops moves too short to produce a step, so a stop before a dropped move applies to the next
+    # move that is kept
+    keep = np.flatnonzero(length > 1e-6)
+    stops_up_to = np.cumsum(np.bincount(stops, minlength=len(end)+1))
+    stop_before = np.diff(np.concatenate([[0], stops_up_to[keep]])) > 0
+    if len(keep):
+        stop_before[0] = True
+
+    start, end, delta, length = start[keep], end[keep], delta[keep], length[keep]
+    feed_mm_min, rapid, line_index = feed_mm_min[keep], rapid[keep], line_index[keep]
+
+    # arcs are approximated by their chord when finding axis limits and junction speeds
+    chord = np.linalg.norm(delta, axis=1, keepdims=True)
+    unit = np.divide(delta, chord, out=np.zeros_like(delta), where=chord>0)
+    axis_speed    = limit_by_axis_maximum(unit, limits.max_rate_mm_s)
+    acceleration  = limit_by_axis_maximum(unit, limits.acceleration_mm_s2)
+    requested     = np.where(rapid, np.inf, np.nan_to_num(feed_mm_min/60, nan=np.inf))
+    nominal       = np.minimum(requested, axis_speed)
+
+    max_entry = np.minimum(junction_speed_squared(unit, limits) if len(unit) else np.zeros(0), nominal**2)
+    max_entry[1:] = np.minimum(max_entry[1:], nominal[:-1]**2)
+    max_entry[stop_before] = 0
+    entry_squared, exit_squared = plan_speeds_squared(max_entry, length, acceleration, lookahead=limits.planner_blocks)
+    peak, duration = trapezoid_profile(entry_squared, exit_squared, nominal, length, acceleration)
+
+    return GCodeSimulation(
+        line_index      = line_index,
+        start           = start,
+        end             = end,
+        length          = length,
+        rapid           = rapid,
+        requested_speed = requested,
+        nominal_speed   = nominal,
+        entry_speed     = np.sqrt(entry_squared),
+        exit_speed      = np.sqrt(exit_squared),
+        peak_speed      = peak,
+        duration        = duration,
+        dwell_seconds   = dwell_seconds,
+    )
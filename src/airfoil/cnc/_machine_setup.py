@@ -1,39 +1,86 @@
-import pandas as pd
+from dataclasses import dataclass, fields
+from datetime import datetime
 
 import numpy as np
 from numpy.typing import ArrayLike
 
-import pyvista as pv
-
-from .cnc_machine_mesh import axis
 from ._gcode_builder import GCodeBuilder as gcb
+from ._motion_planning import MachineLimits, plan_feedrate
 
 from ..util import (
-    create_ruled_surface,
     compensate_feedrate,
-    project_line_to_plane,
+    project_lines_to_planes,
     deflection_angle_padded,
     ensure_closed,
     blur1d,
     map_to_range,
     remove_sequential_duplicates,
+    decimate_synchronized,
 )
 
 from .._Decomposer import Decomposer
 from .._WingSegment import WingSegment
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+
+@dataclass
+class CutPlan:
+    """Everything `MachineSetup` derives from the wing segment before cutting, computed once by
+    `MachineSetup.cut_plan()` and shared by `plot`, `_instructions` and `prepare_gcode`. Arrays are read-only."""
+    profile_a       : np.ndarray
+    """(n, 2) left profile of the cut, at the end of the wing segment"""
+    profile_b       : np.ndarray
+    """(n, 2) right profile of the cut, with points corresponding to `profile_a`"""
+    left            : np.ndarray
+    """(n, 3) the cut surface extended to the left toolhead plane"""
+    right           : np.ndarray
+    """(n, 3) the cut surface extended to the right toolhead plane"""
+    xyza            : np.ndarray
+    """(n, 4) toolhead positions along the cut. XY is the right toolhead, ZA the left"""
+    surface_speed   : np.ndarray
+    """(n,) approximate wire speed at each point in mm/s, for previews"""
+    feedrate        : np.ndarray
+    """(n-1,) feedrate of each move along `xyza`, as passed to `GCodeBuilder.path_absolute`"""
+    lead_in         : np.ndarray
+    """(k, 2) travel path into the foam, followed by both toolheads"""
+    lead_out        : np.ndarray
+    """(k, 2) travel path out of the foam, followed by both toolheads"""
+    removed_points  : int
+    """Points removed from each profile by decimation, see `MachineSetup.decimation_tolerance`"""
+
+    def __post_init__(self):
+        for item in fields(self):
+            value = getattr(self, item.name)
+            if isinstance(value, np.ndarray):
+                value.setflags(write=False)
+
 
 class MachineSetup(BaseModel):
-    wing_segment       : WingSegment
-    foam_depth         : float
-    foam_height        : float
-    plane_spacing      : float
-    decomposer         : Decomposer = Field(default_factory=lambda:Decomposer())
-    min_cut_speed_mm_s : float      = 100
-    max_cut_speed_mm_s : float      = 200
-    cut_current_amps   : float      = 1.85
-    travel_speed       : float      = 1000
+    wing_segment           : WingSegment
+    foam_depth             : float
+    foam_height            : float
+    plane_spacing          : float
+    decomposer             : Decomposer    = Field(default_factory=lambda:Decomposer())
+    min_cut_speed_mm_s     : float         = 100
+    max_cut_speed_mm_s     : float         = 200
+    cut_current_amps       : float         = 1.85
+    travel_speed           : float         = 1000
+    machine_limits         : MachineLimits = Field(default_factory=lambda:MachineLimits())
+    use_feedrate_planner   : bool          = True
+    """Plan cut feedrates with `plan_feedrate` rather than blurring the deflection angle between
+    `min_cut_speed_mm_s` and `max_cut_speed_mm_s`"""
+    cut_acceleration_mm_s2 : float|None    = 2.0
+    """How quickly the planner lets the cut speed change, see `plan_feedrate`"""
+    decimation_tolerance   : float|None    = 0.02
+    """Points are removed from both cut profiles together while neither moves more than this. `None` to disable"""
+    arc_tolerance          : float|None    = None
+    """If set, `prepare_gcode` replaces runs of cut moves with `G2`/`G3` arcs that stay within this many mm of the
+    path, see `GCodeBuilder.path_absolute`. GRBL only arcs the XY toolhead and moves ZA linearly alongside it, so
+    this only shortens the program where the ZA toolhead moves in a straight line while XY follows a circle. Holes
+    and curves present on both profiles (including scaled or tapered copies) are always cut with `G1` moves"""
+
+    _cut_plan_cache        : tuple[WingSegment, str, CutPlan]|None = PrivateAttr(default=None)
     
     def with_recentered_part(self):
         foam_center = np.array([
@@ -45,6 +92,9 @@ class MachineSetup(BaseModel):
         return self.model_copy(update={"wing_segment":self.wing_segment.with_translation(offset[-2:])})
 
     def plot(self, state:tuple[float,float,float,float]|ArrayLike|None=None):
+        import pyvista as pv
+        from .cnc_machine_mesh import axis
+        from ..util._pyvista_helpers import create_ruled_surface
 
         _state = np.array(state) if state is not None else np.array([0, self.foam_height, 0, self.foam_height])
         mesh_foam = pv.Box((
@@ -57,10 +107,11 @@ class MachineSetup(BaseModel):
         decomposer = Decomposer() # TODO: use the class decomposer?
         mesh_target = self.wing_segment.to_mesh(decomposer)
 
-        a,b, speed = self._prepare_cut_surface()
+        plan = self.cut_plan()
+        a, b = plan.left, plan.right
 
         cut_surface = create_ruled_surface(a,b)
-        cut_surface.cell_data["speed mm/s"] = speed[1:]
+        cut_surface.cell_data["speed mm/s"] = plan.surface_speed[1:]
 
         instructions = self._instructions()
         ia = np.insert(instructions[:,1:3], 0, -self.plane_spacing/2, axis=-1)
@@ -115,44 +166,67 @@ class MachineSetup(BaseModel):
             np.vstack((np.ones_like(x) *  self.plane_spacing/2, z,a)).T,
         )
     
-    def _prepare_cut_surface(self):
+    def cut_profiles(self) -> tuple[np.ndarray, np.ndarray, int]:
+        """The left and right profiles the wire follows through the foam, with corresponding points.
+
+        Returns `(a, b, removed)` where `removed` is the number of points (and so cut moves) that decimation to
+        `decimation_tolerance` removed from each profile.
+        """
         a, b = self.wing_segment.decompose(self.decomposer)
         a = ensure_closed(remove_sequential_duplicates(np.concat(a)))
         b = ensure_closed(remove_sequential_duplicates(np.concat(b)))
+        if self.decimation_tolerance is None:
+            return a, b, 0
+        keep = decimate_synchronized([a, b], self.decimation_tolerance)
+        return a[keep], b[keep], len(a)-len(keep)
+
+    def cut_plan(self) -> CutPlan:
+        """The projected cut, speeds and toolhead path for this setup. Cached until a field of the setup changes."""
+        key = self.model_dump_json(exclude={"wing_segment"})
+        cached = self._cut_plan_cache
+        if cached is not None and cached[0] is self.wing_segment and cached[1] == key:
+            return cached[2]
+        plan = self._compute_cut_plan()
+        self._cut_plan_cache = (self.wing_segment, key, plan)
+        return plan
+
+    def _compute_cut_plan(self) -> CutPlan:
+        a, b, removed = self.cut_profiles()
+        assert all(np.linalg.norm(np.diff(a,axis=0),axis=-1)!=0)
+        assert all(np.linalg.norm(np.diff(b,axis=0),axis=-1)!=0)
         a_3d = np.insert(a, 0, -self.wing_segment.length/2, axis=-1)
         b_3d = np.insert(b, 0,  self.wing_segment.length/2, axis=-1)
-        afa_projected = []
-        afb_projected = []
-        for a_3di, b_3di in zip(
+        afa_projected, afb_projected = project_lines_to_planes(
             a_3d,
             b_3d,
-        ):
-            afa_projected.append(project_line_to_plane(a_3di, b_3di, "yz", -self.plane_spacing/2))
-            afb_projected.append(project_line_to_plane(a_3di, b_3di, "yz",  self.plane_spacing/2))
-        afa_projected = np.array(afa_projected)
-        afb_projected = np.array(afb_projected)
-        assert all(np.linalg.norm(np.diff(a,axis=0),axis=-1)!=0)
-        assert all(np.linalg.norm(np.diff(b,axis=0),axis=-1)!=0)
-        speed = map_to_range(
+            "yz",
+            (-self.plane_spacing/2, self.plane_spacing/2),
+        )
+
+        # note: a/b swapped here on purpose. zy is left axes. xy is right axes
+        xyza = np.concat([afb_projected[:,1:],afa_projected[:,1:]],axis=-1) 
+
+        # enforce a speed limit based on curvature; since each side might be different, base it on the worst case:
+        deflection = np.maximum(
+            deflection_angle_padded(a), # error on NAN
+            deflection_angle_padded(b),
+        )
+
+        # how much further the toolheads travel than the wire does at the foam surface
+        projected_ratio_a = np.linalg.norm(np.diff(afa_projected))/np.linalg.norm(np.diff(a))
+        projected_ratio_b = np.linalg.norm(np.diff(afb_projected))/np.linalg.norm(np.diff(b))
+
+        surface_speed = map_to_range(
             blur1d(
-                np.max([
-                    deflection_angle_padded(a), # error on NAN
-                    deflection_angle_padded(b),
-                ],axis=0),
+                deflection,
                 count=21,
                 std=6
             ),
             self.max_cut_speed_mm_s,
             self.min_cut_speed_mm_s
-        )
-        speed_multiplier = (
-             (np.linalg.norm(np.diff(afa_projected))/np.linalg.norm(np.diff(a)))
-            +(np.linalg.norm(np.diff(afb_projected))/np.linalg.norm(np.diff(b)))
-        )/2
-        return afa_projected, afb_projected, (speed*speed_multiplier)
+        ) * (projected_ratio_a + projected_ratio_b)/2
 
-    def _instructions(self, record_name:str|None=None):
-        a,b,speed = self._prepare_cut_surface()
+        # compute lead-in and lead-out
         ab_all = np.concat([a,b], axis=0)
         max_y_lead_in_out = np.max(ab_all, axis=0)[1]
         li = np.array([
@@ -166,6 +240,71 @@ class MachineSetup(BaseModel):
             [ self.foam_depth+5, self.foam_height/2],
         ])
 
+        return CutPlan(
+            profile_a      = a,
+            profile_b      = b,
+            left           = afa_projected,
+            right          = afb_projected,
+            xyza           = xyza,
+            surface_speed  = surface_speed,
+            feedrate       = self._cut_feedrate(
+                xyza,
+                deflection[:-1],
+                # compensate for the fact that tooleads are at some distance from the foam surface and so can
+                # actually move faster in some cases.
+                speed_skew_multiplier = min(projected_ratio_a, projected_ratio_b),
+            ),
+            lead_in        = li,
+            lead_out       = lo,
+            removed_points = removed,
+        )
+
+    def _cut_feedrate(self, xyza:np.ndarray, deflection:np.ndarray, speed_skew_multiplier:float) -> np.ndarray:
+        # compensate for the 4D interpolation speed of the CNC machine
+        # which makes the toolheads move slower than expected without this
+        # because it treats the feedrate as applying to the 4d space, and not each 2d space independently
+        feedrate_compensation = np.array([compensate_feedrate(*item) for item in np.diff(xyza,axis=0)])
+
+        if self.use_feedrate_planner:
+            # cut at full speed, slowing only as much as the corners and the machine require
+            corner_feedrate = map_to_range(deflection, self.max_cut_speed_mm_s, self.min_cut_speed_mm_s)
+            feedrate = plan_feedrate(
+                xyza,
+                np.full(len(xyza)-1, self.max_cut_speed_mm_s) * speed_skew_multiplier * feedrate_compensation,
+                limits                 = self.machine_limits,
+                max_junction_feedrate  = (
+                    corner_feedrate[1:]
+                    * speed_skew_multiplier
+                    * np.minimum(feedrate_compensation[:-1], feedrate_compensation[1:])
+                ),
+                cut_acceleration_mm_s2 = self.cut_acceleration_mm_s2,
+                start_at_rest          = False,
+                end_at_rest            = False,
+            )
+            # path_absolute rounds to the nearest 0.5; never let that produce F0
+            return np.maximum(feedrate, 0.5)
+        feedrate = map_to_range(
+            blur1d(
+                deflection,
+                count=21,
+                std=6
+            ),
+            self.max_cut_speed_mm_s,
+            self.min_cut_speed_mm_s
+        )
+        feedrate *= speed_skew_multiplier
+        feedrate *= feedrate_compensation
+        return feedrate
+
+    def _prepare_cut_surface(self):
+        plan = self.cut_plan()
+        return plan.left, plan.right, plan.surface_speed
+
+    def _instructions(self, record_name:str|None=None):
+        plan = self.cut_plan()
+        a, b, speed = plan.left, plan.right, plan.surface_speed
+        li, lo = plan.lead_in, plan.lead_out
+
         # i dont remember why this was commented out,
         # but i seem to remember it prevents a bug. its not important enough to re-enable for now.
         # li = linear_resampling_to_length(li,3)
@@ -207,75 +346,14 @@ class MachineSetup(BaseModel):
             
             folder = Path("./data/records/")
             folder.mkdir(exist_ok=True)
-            file = folder / f"{pd.Timestamp.now():%Y-%m-%d %H%M} {record_name}.txt"
+            file = folder / f"{datetime.now():%Y-%m-%d %H%M} {record_name}.txt"
             file.write_text(rec)
 
         return instructions
 
     def prepare_gcode(self):
-        a, b = self.wing_segment.decompose(self.decomposer)
-        a = ensure_closed(remove_sequential_duplicates(np.concat(a)))
-        b = ensure_closed(remove_sequential_duplicates(np.concat(b)))
-        assert all(np.linalg.norm(np.diff(a,axis=0),axis=-1)!=0)
-        assert all(np.linalg.norm(np.diff(b,axis=0),axis=-1)!=0)
-        a_3d = np.insert(a, 0, -self.wing_segment.length/2, axis=-1)
-        b_3d = np.insert(b, 0,  self.wing_segment.length/2, axis=-1)
-        afa_projected = []
-        afb_projected = []
-        for a_3di, b_3di in zip(
-            a_3d,
-            b_3d,
-        ):
-            afa_projected.append(project_line_to_plane(a_3di, b_3di, "yz", -self.plane_spacing/2))
-            afb_projected.append(project_line_to_plane(a_3di, b_3di, "yz",  self.plane_spacing/2))
-        afa_projected = np.array(afa_projected)
-        afb_projected = np.array(afb_projected)
-        
-        # note: a/b swapped here on purpose. zy is left axes. xy is right axes
-        xyza = np.concat([afb_projected[:,1:],afa_projected[:,1:]],axis=-1) 
-
-        # enforce a speed limit based on curvature; since each side might be different, base it on the worst case:
-        feedrate = map_to_range(
-            blur1d(
-                np.maximum(
-                    deflection_angle_padded(a)[:-1], # error on NAN
-                    deflection_angle_padded(b)[:-1],
-                ),
-                count=21,
-                std=6
-            ),
-            self.max_cut_speed_mm_s,
-            self.min_cut_speed_mm_s
-        )
-
-        # compensate for the fact that tooleads are at some distance from the foam surface and so can actually move faster
-        # in some cases.
-        speed_skew_multiplier = np.minimum(
-            (np.linalg.norm(np.diff(afa_projected))/np.linalg.norm(np.diff(a))),
-            (np.linalg.norm(np.diff(afb_projected))/np.linalg.norm(np.diff(b)))
-        )
-        feedrate *= speed_skew_multiplier
-
-        # compensate for the 4D interpolation speed of the CNC machine
-        # which makes the toolheads move slower than expected without this
-        # because it treats the feedrate as applying to the 4d space, and not each 2d space independently
-        feedrate *= np.array([compensate_feedrate(*item) for item in np.diff(xyza,axis=0)])
-        
-
-        # compute lead-in and lead-out
-        ab_all = np.concat([a,b], axis=0)
-        max_y_lead_in_out = np.max(ab_all, axis=0)[1]
-        li = np.array([
-            [                 0,    self.foam_height ],
-            [                -5,    self.foam_height ],
-            [                -5, self.foam_height+20 ],
-            [ self.foam_depth+5, self.foam_height+20 ],
-            [ max(self.foam_depth+5, max_y_lead_in_out+5), self.foam_height/2 ],
-        ])
-        lo = np.array([
-            [ self.foam_depth+5, self.foam_height/2],
-        ])
-
+        plan = self.cut_plan()
+        xyza, feedrate, li, lo = plan.xyza, plan.feedrate, plan.lead_in, plan.lead_out
 
         result = (
             gcb()
@@ -289,8 +367,9 @@ class MachineSetup(BaseModel):
                 feedrate=np.concat([np.full(len(li)-1,self.travel_speed),[self.max_cut_speed_mm_s]])
             )
             .path_absolute(
-                xyza     = xyza,
-                feedrate = feedrate,
+                xyza          = xyza,
+                feedrate      = feedrate,
+                arc_tolerance = self.arc_tolerance,
             )
             .path_absolute(
                 xyza=np.concat([
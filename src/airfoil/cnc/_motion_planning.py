@@ -0,0 +1,220 @@
+from __future__ import annotations
+from pathlib import Path
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from pydantic import BaseModel
+
+
+AXES = ("x", "y", "z", "a")
+
+
+class MachineLimits(BaseModel):
+    """Per-axis limits of the controller's motion planner, in the units FluidNC uses in `config.yaml`.
+
+    The defaults match `hardware/xpro-v5-esp32-fluidnc/config.yaml`. `junction_deviation_mm` and `planner_blocks`
+    are not set there, so they take FluidNC's defaults."""
+    max_rate_mm_per_min      : tuple[float, float, float, float] = (5000, 5000, 5000, 5000)
+    acceleration_mm_per_sec2 : tuple[float, float, float, float] = (400, 400, 400, 400)
+    junction_deviation_mm    : float = 0.01
+    planner_blocks           : int   = 16
+    """Number of moves the controller can plan ahead. The last move in the planner must always be able to stop."""
+
+    @classmethod
+    def from_fluidnc_config(cls, path:Path|str) -> MachineLimits:
+        """Read the `axes` section of a FluidNC `config.yaml` (requires `pyyaml`)"""
+        import yaml
+        with open(path) as file:
+            config = yaml.safe_load(file)
+        axes = config["axes"]
+        defaults = cls()
+        return cls(
+            max_rate_mm_per_min      = tuple(axes[axis]["max_rate_mm_per_min"]      for axis in AXES),
+            acceleration_mm_per_sec2 = tuple(axes[axis]["acceleration_mm_per_sec2"] for axis in AXES),
+            junction_deviation_mm    = config.get("junction_deviation_mm", defaults.junction_deviation_mm),
+            planner_blocks           = config.get("planner_blocks",        defaults.planner_blocks),
+        )
+
+    @property
+    def max_rate_mm_s(self) -> np.ndarray:
+        return np.array(self.max_rate_mm_per_min, dtype=float)/60
+
+    @property
+    def acceleration_mm_s2(self) -> np.ndarray:
+        return np.array(self.acceleration_mm_per_sec2, dtype=float)
+
+
+def limit_by_axis_maximum(unit_vectors:np.ndarray, axis_maximum:np.ndarray) -> np.ndarray:
+    """For each row of `unit_vectors` (n, 4), the largest magnitude along that direction which does not exceed any
+    axis' maximum. The vectorised equivalent of GRBL's `limit_value_by_axis_maximum`."""
+    with np.errstate(divide="ignore"):
+        return np.min(axis_maximum/np.abs(unit_vectors), axis=1)
+
+
+def junction_speed_squared(
+        unit_vectors:np.ndarray,
+        limits:MachineLimits,
+    ) -> np.ndarray:
+    """Squared maximum speed (mm/s)² through the junction at the start of each move (n,) given each move's unit
+    direction (n, 4), using GRBL's junction deviation model. The first move gets 0."""
+    previous = unit_vectors[:-1]
+    current  = unit_vectors[1:]
+    cos_theta = -np.einsum("ij,ij->i", previous, current)
+
+    junction_vector = current - previous
+    junction_length = np.linalg.norm(junction_vector, axis=1, keepdims=True)
+    junction_unit = np.divide(junction_vector, junction_length, out=np.zeros_like(junction_vector), where=junction_length>0)
+    junction_acceleration = limit_by_axis_maximum(junction_unit, limits.acceleration_mm_s2)
+
+    sin_theta_d2 = np.sqrt(np.clip(0.5*(1-cos_theta), 0, 1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        speed_squared = junction_acceleration*limits.junction_deviation_mm*sin_theta_d2/(1-sin_theta_d2)
+    speed_squared = np.where(cos_theta >  0.999999, 0,      speed_squared) # reversal
+    speed_squared = np.where(cos_theta < -0.999999, np.inf, speed_squared) # straight on
+    return np.concatenate([[0], speed_squared])
+
+
+def plan_speeds_squared(
+        max_entry_squared:np.ndarray,
+        length:np.ndarray,
+        acceleration:np.ndarray,
+        lookahead:int|None=None,
+        final_squared:float=0,
+    ) -> tuple[np.ndarray, np.ndarray]:
+    """The backward and forward planner passes. Returns `(entry, exit)` squared speeds of each move.
+
+    `max_entry_squared` (n,) bounds the squared speed at the start of each move (junction and nominal speed limits,
+    0 where the machine must stop). The last move exits at no more than `final_squared`, which is 0 if the machine
+    stops after it.
+    If `lookahead` is given, each move must also be able to stop within the `lookahead` moves starting with itself,
+    as the controller cannot plan further ahead than its planner buffer.
+
+    Each pass is a recurrence like `w[i] = min(limit[i], w[i+1] + 2*a[i]*d[i])`. Unrolled with the prefix sum
+    `S` of `2*a*d` this is `w[i] = min(limit[k] + S[k] for k>=i) - S[i]`, a running minimum, so neither pass needs
+    a python loop.
+    """
+    moves = len(length)
+    limit = np.concatenate([max_entry_squared, [final_squared]])
+    prefix = np.concatenate([[0], np.cumsum(2*acceleration*length)])
+
+    reachable = limit + prefix
+    if lookahead is None or lookahead >= moves:
+        backward = np.minimum.accumulate(reachable[::-1])[::-1]
+    else:
+        padded = np.concatenate([reachable, np.full(lookahead, np.inf)])
+        backward = sliding_window_view(padded, lookahead+1).min(axis=1)
+        buffer_end = np.arange(moves+1)+lookahead
+        backward = np.minimum(backward, np.where(buffer_end < moves, prefix[np.minimum(buffer_end, moves)], np.inf))
+    backward = np.maximum(backward - prefix, 0)
+
+    forward = np.minimum(prefix + np.minimum.accumulate(backward - prefix), backward)
+    forward = np.maximum(forward, 0)
+    return forward[:-1], forward[1:]
+
+
+def trapezoid_profile(
+        entry_squared:np.ndarray,
+        exit_squared:np.ndarray,
+        nominal:np.ndarray,
+        length:np.ndarray,
+        acceleration:np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+    """Peak speed (mm/s) and duration (s) of each move accelerating from its entry speed towards `nominal` then
+    decelerating to its exit speed"""
+    nominal_squared = nominal**2
+    accelerate_distance = (nominal_squared - entry_squared)/(2*acceleration)
+    decelerate_distance = (nominal_squared - exit_squared)/(2*acceleration)
+    cruises = accelerate_distance + decelerate_distance <= length
+
+    peak_squared = np.where(cruises, nominal_squared, (2*acceleration*length + entry_squared + exit_squared)/2)
+    peak = np.sqrt(np.minimum(peak_squared, nominal_squared))
+    entry, exit_ = np.sqrt(entry_squared), np.sqrt(exit_squared)
+    ramp_distance = np.where(cruises, accelerate_distance + decelerate_distance, length)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cruise_time = np.where(cruises, (length - ramp_distance)/peak, 0)
+        duration = (peak - entry)/acceleration + (peak - exit_)/acceleration + cruise_time
+    return peak, np.nan_to_num(duration)
+
+
+def plan_feedrate(
+        xyza:np.ndarray,
+        feedrate:np.ndarray,
+        limits:MachineLimits|None=None,
+        max_junction_feedrate:np.ndarray|None=None,
+        cut_acceleration_mm_s2:float|None=None,
+        start_at_rest:bool=True,
+        end_at_rest:bool=True,
+    ) -> np.ndarray:
+    """Reduce the nominal `feedrate` (mm/min, one per move along `xyza`) to what the machine will actually achieve,
+    so the controller never has to throttle a move the G-code asked to go faster.
+
+    Two constraints from the hot wire are applied first, planned over the whole path:
+    - `max_junction_feedrate` (n-1,) caps the speed through each corner between moves
+    - `cut_acceleration_mm_s2` caps how quickly the cut speed may change. The wire keeps melting foam while it
+      slows, so abrupt slow-downs leave a wider kerf at corners; ramping the speed spreads the change out instead.
+
+    The result is then planned the way the controller will: per-axis acceleration, junction deviation and only
+    `limits.planner_blocks` moves of lookahead.
+
+    Moves too short to produce a step are dropped by the controller (as in `simulate_gcode`), so they are planned
+    without, and each is given the feedrate of the move before it (or after it, at the start of the path).
+
+    Returns the peak speed each move reaches (mm/min).
+    """
+    limits = limits or MachineLimits()
+    xyza     = np.asarray(xyza, dtype=float)
+    feedrate = np.asarray(feedrate, dtype=float)
+    delta    = np.diff(xyza, axis=0)
+    length   = np.linalg.norm(delta, axis=1)
+
+    keep = np.flatnonzero(length > 1e-6)
+    if len(keep) == 0:
+        return feedrate.copy()
+    if len(keep) < len(length):
+        # a junction limit before a dropped move applies to the next move that is kept
+        entry_limit = np.full(len(length), np.inf)
+        if max_junction_feedrate is not None:
+            entry_limit[1:] = max_junction_feedrate
+        kept_entry_limit = np.full(len(keep), np.inf)
+        next_kept = np.searchsorted(keep, np.arange(len(length)))
+        before_last = next_kept < len(keep)
+        np.minimum.at(kept_entry_limit, next_kept[before_last], entry_limit[before_last])
+        kept_feedrate = plan_feedrate(
+            xyza                   = xyza[np.concatenate([[0], keep+1])],
+            feedrate               = feedrate[keep],
+            limits                 = limits,
+            max_junction_feedrate  = None if max_junction_feedrate is None else kept_entry_limit[1:],
+            cut_acceleration_mm_s2 = cut_acceleration_mm_s2,
+            start_at_rest          = start_at_rest,
+            end_at_rest            = end_at_rest,
+        )
+        previous_kept = np.maximum(np.searchsorted(keep, np.arange(len(length)), side="right") - 1, 0)
+        return kept_feedrate[previous_kept]
+
+    nominal  = feedrate/60
+    unit     = delta/length[:, None]
+
+    nominal = np.minimum(nominal, limit_by_axis_maximum(unit, limits.max_rate_mm_s))
+    acceleration = limit_by_axis_maximum(unit, limits.acceleration_mm_s2)
+    junction_squared = junction_speed_squared(unit, limits)
+    if max_junction_feedrate is not None:
+        junction_squared[1:] = np.minimum(junction_squared[1:], (np.asarray(max_junction_feedrate, dtype=float)/60)**2)
+
+    def plan(nominal:np.ndarray, acceleration:np.ndarray, lookahead:int|None) -> np.ndarray:
+        max_entry = np.minimum(junction_squared, nominal**2)
+        max_entry[1:] = np.minimum(max_entry[1:], nominal[:-1]**2)
+        if not start_at_rest:
+            max_entry[0] = nominal[0]**2
+        entry_squared, exit_squared = plan_speeds_squared(
+            max_entry,
+            length,
+            acceleration,
+            lookahead     = lookahead,
+            final_squared = 0 if end_at_rest else nominal[-1]**2,
+        )
+        peak, _ = trapezoid_profile(entry_squared, exit_squared, nominal, length, acceleration)
+        return peak
+
+    if cut_acceleration_mm_s2 is not None:
+        nominal = plan(nominal, np.minimum(acceleration, cut_acceleration_mm_s2), lookahead=None)
+    return plan(nominal, acceleration, lookahead=limits.planner_blocks)*60
@@ -1,7 +1,23 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Iterable
 import serial
 from serial import Serial
 import time
 
+from ._status import is_status_report, parse_status
+from ._telemetry import StreamTelemetry
+
+
+@dataclass
+class StreamResult:
+    """Outcome of `CNC.stream_gcode_lines`"""
+    log      : str                   = ""
+    ok_count : int                   = 0
+    errors   : list[tuple[int, str]] = field(default_factory=list)
+    """`(line index, response)` for each `error:` or `ALARM:` response"""
+    success  : bool                  = True
+
 class CNC:
     serial:Serial
 
@@ -238,3 +254,112 @@ class CNC:
             log+="FAILED\r\n"
             self.serial.write("M3 S0\r\n".encode("ascii"))
         return log
+
+    def stream_gcode_lines(
+            self,
+            gcode:Iterable[str],
+            rx_buffer_size:int=128,
+            timeout_seconds:float=20,
+            stop_on_error:bool=True,
+            telemetry:StreamTelemetry|None=None,
+            status_interval:float|None=None,
+        ) -> StreamResult:
+        """Stream lines using GRBL's character counting protocol.
+
+        Rather than waiting for each `ok` before sending the next line (like `send_gcode_lines`), this keeps track of
+        how many bytes have been sent but not yet acknowledged, and keeps sending as long as the next line still fits
+        in the controller's receive buffer of `rx_buffer_size` bytes. Every `ok` or `error:` response acknowledges
+        the oldest unacknowledged line.
+
+        Lines should not be terminated with `"\r\n"` as this will be automatically added.
+        If any line errors (and `stop_on_error`), an alarm is reported, or no response arrives within
+        `timeout_seconds`, no further lines are sent and `M3 S0` is sent to switch off the wire.
+
+        If `status_interval` is given, a `?` status request is sent at most every `status_interval` seconds while
+        streaming; status reports are left out of the log. If `telemetry` is given, each line's send and
+        acknowledgement times and each status report are recorded to it, and it is closed when streaming ends.
+        """
+        result = StreamResult()
+        log = [self.read_all()]
+        in_flight:deque[tuple[int,int]] = deque() # (line index, bytes)
+        in_flight_bytes = 0
+        received = b""
+        last_response_time = time.time()
+        last_status_request = 0.0
+
+        def read_responses() -> bool:
+            """Read whatever the controller has sent. Returns False on timeout"""
+            nonlocal received, in_flight_bytes, last_response_time, last_status_request
+            if status_interval is not None and time.time() - last_status_request >= status_interval:
+                self.serial.write(b"?")
+                last_status_request = time.time()
+            received += self.serial.read(max(1, self.serial.in_waiting))
+            *lines, received = received.split(b"\n")
+            for raw_line in lines:
+                line = raw_line.decode("ascii").strip()
+                if is_status_report(line):
+                    if telemetry is not None:
+                        telemetry.record_status(parse_status(line))
+                    continue
+                log.append(raw_line.decode("ascii")+"\n")
+                last_response_time = time.time()
+                if line.startswith("ALARM"):
+                    result.errors.append((in_flight[0][0] if in_flight else -1, line))
+                    result.success = False
+                    if telemetry is not None:
+                        for line_index, _ in in_flight:
+                            telemetry.record_ack(line_index, line, last_response_time)
+                elif (line == "ok" or line.startswith("error")) and in_flight:
+                    line_index, line_bytes = in_flight.popleft()
+                    in_flight_bytes -= line_bytes
+                    if telemetry is not None:
+                        telemetry.record_ack(line_index, line, last_response_time)
+                    if line == "ok":
+                        result.ok_count += 1
+                    else:
+                        result.errors.append((line_index, line))
+                        if stop_on_error:
+                            result.success = False
+            if time.time() - last_response_time > timeout_seconds:
+                log.append("TIMEOUT\r\n")
+                print(f"Timeout waiting for 'ok' with {len(in_flight)} lines unacknowledged")
+                result.success = False
+                return False
+            return True
+
+        try:
+            # check every line before sending any, so a bad line cannot stop the stream part way through a cut
+            commands = [(gc+"\r\n").encode("ascii") for gc in gcode]
+            for line_index, command in enumerate(commands):
+                if len(command) > rx_buffer_size:
+                    raise ValueError(f"Line {line_index} is longer than rx_buffer_size={rx_buffer_size}: {command.decode('ascii').strip()}")
+
+            for line_index, command in enumerate(commands):
+                while result.success and in_flight and in_flight_bytes + len(command) > rx_buffer_size:
+                    if not read_responses():
+                        break
+                if not result.success:
+                    break
+                if not in_flight:
+                    last_response_time = time.time()
+                self.serial.write(command)
+                if telemetry is not None:
+                    telemetry.record_send(line_index)
+                log.append(command.decode("ascii"))
+                in_flight.append((line_index, len(command)))
+                in_flight_bytes += len(command)
+
+            while result.success and in_flight and read_responses():
+                pass
+        except BaseException:
+            result.success = False
+            raise
+        finally:
+            # also reached if anything above raises (e.g. a serial error or KeyboardInterrupt) mid-stream
+            if not result.success:
+                log.append("FAILED\r\n")
+                self.serial.write("M3 S0\r\n".encode("ascii"))
+            if telemetry is not None:
+                telemetry.close()
+            result.log = "".join(log)
+        return result
@@ -0,0 +1,49 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+import time
+
+
+@dataclass
+class MachineStatus:
+    """A parsed GRBL/FluidNC real-time status report like
+    `<Run|MPos:1.000,2.000,3.000,4.000|Bf:15,128|FS:500,0>`
+
+    Fields that were not present in the report are `None`."""
+    state                    : str
+    machine_position         : tuple[float, ...]|None = None
+    work_position            : tuple[float, ...]|None = None
+    feed_rate                : float|None             = None
+    spindle_speed            : float|None             = None
+    planner_blocks_available : int|None               = None
+    rx_bytes_available       : int|None               = None
+    fields                   : dict[str, str]         = field(default_factory=dict)
+    """All `key:value` fields of the report, unparsed"""
+    received_time            : float                  = field(default_factory=time.time)
+
+
+def is_status_report(line:str) -> bool:
+    return line.startswith("<") and line.endswith(">")
+
+
+def parse_status(line:str) -> MachineStatus:
+    """Parse a status report (the response to the `?` real-time command)"""
+    if not is_status_report(line):
+        raise ValueError(f"Not a status report: {line}")
+    state, *parts = line[1:-1].split("|")
+    fields = dict(part.split(":", 1) for part in parts if ":" in part)
+
+    def floats(key:str) -> tuple[float, ...]|None:
+        return None if key not in fields else tuple(float(value) for value in fields[key].split(","))
+
+    feed_speed = floats("FS") or floats("F")
+    buffer     = floats("Bf")
+    return MachineStatus(
+        state                    = state,
+        machine_position         = floats("MPos"),
+        work_position            = floats("WPos"),
+        feed_rate                = None if feed_speed is None else feed_speed[0],
+        spindle_speed            = None if feed_speed is None or len(feed_speed)<2 else feed_speed[1],
+        planner_blocks_available = None if buffer is None else int(buffer[0]),
+        rx_bytes_available       = None if buffer is None else int(buffer[1]),
+        fields                   = fields,
+    )
@@ -0,0 +1,243 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Hashable
+import time
+import zipfile
+
+import numpy as np
+
+from ._status import MachineStatus
+
+
+COLUMNS:dict[str, np.dtype] = {
+    "line"                     : np.dtype(np.int64),
+    "send_time"                : np.dtype(np.float64),
+    "ack_time"                 : np.dtype(np.float64),
+    "response"                 : np.dtype(np.int16),
+    "rx_bytes_available"       : np.dtype(np.int32),
+    "planner_blocks_available" : np.dtype(np.int32),
+    "feed_rate"                : np.dtype(np.float32),
+    "x"                        : np.dtype(np.float32),
+    "y"                        : np.dtype(np.float32),
+    "z"                        : np.dtype(np.float32),
+    "a"                        : np.dtype(np.float32),
+}
+"""One row per acknowledged line. `response` is 0 for `ok`, the error number for `error:n` and -1 for anything else
+(e.g. an alarm). Controller columns come from the most recent status report at the time of the acknowledgement and
+are -1 / NaN if no report had been received."""
+
+STATUS_COLUMNS:dict[str, np.dtype] = {
+    "time"                     : np.dtype(np.float64),
+    "rx_bytes_available"       : np.dtype(np.int32),
+    "planner_blocks_available" : np.dtype(np.int32),
+    "feed_rate"                : np.dtype(np.float32),
+    "x"                        : np.dtype(np.float32),
+    "y"                        : np.dtype(np.float32),
+    "z"                        : np.dtype(np.float32),
+    "a"                        : np.dtype(np.float32),
+}
+"""One row per status report"""
+
+
+@dataclass
+class TelemetrySummary:
+    lines                    : int
+    errors                   : int
+    duration_seconds         : float
+    lines_per_second         : float
+    ack_latency_p50          : float
+    ack_latency_p99          : float
+    ack_latency_max          : float
+    starvation_count         : int
+    """Number of gaps longer than `min_starvation_seconds` where every sent line had been acknowledged but the next
+    line had not been sent yet. Frequent or long gaps mean the host, not the machine, is limiting the cut."""
+    starvation_seconds       : float
+    longest_starvation       : float
+    planner_empty_fraction   : float
+    """Fraction of status reports where the planner had as many free blocks as it ever reported (i.e. was empty)"""
+
+
+class StreamTelemetry:
+    """Records timing and controller state for each line streamed by `CNC.stream_gcode_lines` or `AsyncCNC.stream`.
+
+    Rows are collected in fixed size chunks of `chunk_size` rows. If `path` is given, full chunks are appended to
+    that `.npz` file as they fill so memory use stays bounded during long jobs; load it again with
+    `load_telemetry(path)`. Without a `path`, chunks are kept in memory.
+
+    ```python
+    telemetry = StreamTelemetry("./data/telemetry/wing_root.npz")
+    cnc.stream_gcode_lines(lines, telemetry=telemetry, status_interval=0.2)
+    print(telemetry.summary())
+    ```
+    """
+    def __init__(self, path:Path|str|None=None, chunk_size:int=4096):
+        self.path       = None if path is None else Path(path)
+        self.chunk_size = chunk_size
+        self._lines   = _ChunkedColumns(COLUMNS, chunk_size, self.path, "lines")
+        self._status  = _ChunkedColumns(STATUS_COLUMNS, chunk_size, self.path, "status")
+        self._sent:dict[Hashable, tuple[int, float]] = {}
+        self._next_line = 0
+        self._latest_status:MachineStatus|None = None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.unlink(missing_ok=True)
+
+    def record_send(self, key:Hashable, send_time:float|None=None):
+        """Call when a line is written to the controller. `key` identifies the line until it is acknowledged."""
+        self._sent[key] = (self._next_line, time.time() if send_time is None else send_time)
+        self._next_line += 1
+
+    def record_ack(self, key:Hashable, response:str, ack_time:float|None=None):
+        """Call when the response to the line sent with `key` arrives. Unknown keys are ignored."""
+        if key not in self._sent:
+            return
+        line, send_time = self._sent.pop(key)
+        status = self._latest_status
+        position = _position(status)
+        self._lines.append(
+            line                     = line,
+            send_time                = send_time,
+            ack_time                 = time.time() if ack_time is None else ack_time,
+            response                 = _response_code(response),
+            rx_bytes_available       = _or(status and status.rx_bytes_available, -1),
+            planner_blocks_available = _or(status and status.planner_blocks_available, -1),
+            feed_rate                = _or(status and status.feed_rate, np.nan),
+            x=position[0], y=position[1], z=position[2], a=position[3],
+        )
+
+    def record_status(self, status:MachineStatus):
+        self._latest_status = status
+        position = _position(status)
+        self._status.append(
+            time                     = status.received_time,
+            rx_bytes_available       = _or(status.rx_bytes_available, -1),
+            planner_blocks_available = _or(status.planner_blocks_available, -1),
+            feed_rate                = _or(status.feed_rate, np.nan),
+            x=position[0], y=position[1], z=position[2], a=position[3],
+        )
+
+    def close(self):
+        """Write any partly filled chunk to `path`"""
+        self._lines.flush()
+        self._status.flush()
+
+    def to_arrays(self) -> tuple[dict[str, np.ndarray], dict[str, np.ndarray]]:
+        """Returns `(lines, status)` columns, see `COLUMNS` and `STATUS_COLUMNS`"""
+        self.close()
+        if self.path is not None:
+            return load_telemetry(self.path)
+        return self._lines.concatenate(), self._status.concatenate()
+
+    def summary(self, min_starvation_seconds:float=0.005) -> TelemetrySummary:
+        lines, status = self.to_arrays()
+        return summarise_telemetry(lines, status, min_starvation_seconds=min_starvation_seconds)
+
+
+def summarise_telemetry(
+        lines:dict[str, np.ndarray],
+        status:dict[str, np.ndarray],
+        min_starvation_seconds:float=0.005,
+    ) -> TelemetrySummary:
+    order = np.argsort(lines["line"], kind="stable")
+    send_time = lines["send_time"][order]
+    ack_time  = lines["ack_time"][order]
+    latency   = ack_time - send_time
+    duration  = float(ack_time.max() - send_time.min()) if len(order) else 0.0
+
+    # the pipeline is empty between the last outstanding acknowledgement and the next send
+    gaps = send_time[1:] - np.maximum.accumulate(ack_time)[:-1]
+    starved = gaps[gaps > min_starvation_seconds]
+
+    planner = status["planner_blocks_available"]
+    planner = planner[planner >= 0]
+
+    return TelemetrySummary(
+        lines                  = len(order),
+        errors                 = int((lines["response"] != 0).sum()),
+        duration_seconds       = duration,
+        lines_per_second       = len(order)/duration if duration > 0 else float("nan"),
+        ack_latency_p50        = float(np.percentile(latency, 50)) if len(latency) else float("nan"),
+        ack_latency_p99        = float(np.percentile(latency, 99)) if len(latency) else float("nan"),
+        ack_latency_max        = float(latency.max()) if len(latency) else float("nan"),
+        starvation_count       = len(starved),
+        starvation_seconds     = float(starved.sum()),
+        longest_starvation     = float(starved.max()) if len(starved) else 0.0,
+        planner_empty_fraction = float((planner == planner.max()).mean()) if len(planner) else float("nan"),
+    )
+
+
+def load_telemetry(path:Path|str) -> tuple[dict[str, np.ndarray], dict[str, np.ndarray]]:
+    """Load `(lines, status)` columns written by `StreamTelemetry`"""
+    chunks:dict[str, list[tuple[str, np.ndarray]]] = {}
+    with zipfile.ZipFile(path) as archive:
+        for name in sorted(archive.namelist()):
+            table_column, _chunk = name.removesuffix(".npy").rsplit("/", 1)
+            with archive.open(name) as file:
+                chunks.setdefault(table_column, []).append((name, np.lib.format.read_array(file)))
+    def table(prefix:str, columns:dict[str, np.dtype]):
+        return {
+            column: np.concatenate([array for _, array in chunks.get(f"{prefix}/{column}", [])] or [np.empty(0, dtype)])
+            for column, dtype in columns.items()
+        }
+    return table("lines", COLUMNS), table("status", STATUS_COLUMNS)
+
+
+class _ChunkedColumns:
+    """Fixed size column buffers that are appended to a zip of `.npy` files (or kept in memory) as they fill"""
+    def __init__(self, columns:dict[str, np.dtype], chunk_size:int, path:Path|None, prefix:str):
+        self.columns    = columns
+        self.chunk_size = chunk_size
+        self.path       = path
+        self.prefix     = prefix
+        self.chunks:list[dict[str, np.ndarray]] = []
+        self.chunk_count = 0
+        self._new_chunk()
+
+    def _new_chunk(self):
+        self.buffer = {column: np.empty(self.chunk_size, dtype) for column, dtype in self.columns.items()}
+        self.length = 0
+
+    def append(self, **row):
+        for column, value in row.items():
+            self.buffer[column][self.length] = value
+        self.length += 1
+        if self.length == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self.length == 0:
+            return
+        chunk = {column: values[:self.length] for column, values in self.buffer.items()}
+        if self.path is None:
+            self.chunks.append(chunk)
+        else:
+            with zipfile.ZipFile(self.path, "a") as archive:
+                for column, values in chunk.items():
+                    with archive.open(f"{self.prefix}/{column}/{self.chunk_count:06d}.npy", "w") as file:
+                        np.lib.format.write_array(file, values)
+        self.chunk_count += 1
+        self._new_chunk()
+
+    def concatenate(self) -> dict[str, np.ndarray]:
+        return {
+            column: np.concatenate([chunk[column] for chunk in self.chunks] or [np.empty(0, dtype)])
+            for column, dtype in self.columns.items()
+        }
+
+
+def _response_code(response:str) -> int:
+    if response == "ok":
+        return 0
+    if response.startswith("error:") and response[6:].strip().isdigit():
+        return int(response[6:])
+    return -1
+
+def _position(status:MachineStatus|None) -> tuple[float, ...]:
+    if status is None:
+        return (np.nan,)*4
+    position = status.machine_position or status.work_position or ()
+    return (tuple(position) + (np.nan,)*4)[:4]
+
+def _or[T](value:T|None, default:T) -> T:
+    return default if value is None else value
@@ -113,11 +113,24 @@ class SpitfireWing:
         )
         return af
     
+    def create_outlines(self, section_positions: list[float|int]|np.ndarray)->np.ndarray:
+        """The same outlines as `local_airfoil`, for every section at once, as a `(sections, points, 2)` array"""
+        sampler = Airfoil.create_batch_sampler(
+            airfoil         = lambda x: Airfoil.outlines_from_naca4(
+                max_camber=0.02,
+                max_camber_position=0.2,
+                max_thickness=self.local_thickness(x),
+            ),
+            leading_edge    = self.local_chord_setback,
+            dihedral        = lambda x: np.tan(np.deg2rad(self.dihedral_deg)) * x,
+            chord           = self.local_chord_length,
+            washout         = self.local_washbout,
+            rotation_center = lambda x: -self.local_chord_length(x) * 0.2,
+        )
+        return sampler(section_positions)
+    
     def create_airfoils(self, section_positions: list[float|int])->list[Airfoil]:
-        results = []
-        for section_position in section_positions:
-            results.append(self.local_airfoil(section_position))
-        return results
+        return [Airfoil(points=outline) for outline in self.create_outlines(section_positions)]
     
     def create_segments(
         self,
@@ -2,9 +2,11 @@
 
 `naca4` and `naca5` offer named argument alternatives.
 
+`naca_many`, `naca4_many` and `naca5_many` generate many profiles at once as `(k, n, 2)` arrays.
+
 Other NACA serieses are not currently supported.
 """
 
-from airfoil.naca._naca_parse import naca, naca_info
-from airfoil.naca._naca4 import naca4
-from airfoil.naca._naca5 import naca5
\ No newline at end of file
+from airfoil.naca._naca_parse import naca, naca_info, naca_many
+from airfoil.naca._naca4 import naca4, naca4_many
+from airfoil.naca._naca5 import naca5, naca5_many
\ No newline at end of file
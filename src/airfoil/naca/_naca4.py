@@ -1,4 +1,6 @@
 import numpy as np
+from numpy.typing import ArrayLike
+from ._naca_kernel import cosine_spacing, unit_thickness
 
 def naca4_camber(x:np.ndarray, max_camber_position:float, max_camber:float) -> np.ndarray:
     p = max_camber_position
@@ -26,19 +28,27 @@ def naca4_thickness(x:np.ndarray, max_thickness:float) -> np.ndarray:
     t = max_thickness
     return t/0.2*(0.2969*np.sqrt(x) - 0.1260*x-0.3516*x**2 + 0.2843*x**3 - 0.1015*x**4)
 
+def naca_surfaces(x:np.ndarray, thickness:np.ndarray, camber:np.ndarray, dyc_dx:np.ndarray) -> tuple[np.ndarray,np.ndarray]:
+    """Upper and lower surfaces `(..., n, 2)` from the thickness distribution applied perpendicular to the camber line"""
+    theta     = np.arctan(dyc_dx)
+    upper_x = x      - thickness*np.sin(theta)
+    upper_y = camber + thickness*np.cos(theta)
+    lower_x = x      + thickness*np.sin(theta)
+    lower_y = camber - thickness*np.cos(theta)
+    return (
+        np.stack(np.broadcast_arrays(upper_x, upper_y), axis=-1),
+        np.stack(np.broadcast_arrays(lower_x, lower_y), axis=-1),
+    )
+
 def naca4 (max_thickness:float, max_camber:float, max_camber_position:float):
     """
     based on https://web.stanford.edu/~cantwell/AA200_Course_Material/The%20NACA%20airfoil%20series.pdf
     """
-    
+    # one profile is generated on 1D arrays rather than through `naca4_many`; broadcasting a batch of one costs
+    # more than the arithmetic at typical point counts
     def _naca4(n:int=200)->tuple[np.ndarray,np.ndarray]:
-        beta = np.linspace(0, np.pi, n)
-        x = 0.5 * (1 - np.cos(beta))
-        #x = np.linspace(0,1,n)
-        thickness = naca4_thickness(
-            x,
-            max_thickness=max_thickness
-        )
+        x = cosine_spacing(n)
+        thickness = max_thickness/0.2*unit_thickness(n)
         if max_camber==0:
             camber = np.zeros_like(x)
             dyc_dx = np.zeros_like(x)
@@ -48,18 +58,45 @@ def naca4 (max_thickness:float, max_camber:float, max_camber_position:float):
                 max_camber_position=max_camber_position,
                 max_camber=max_camber
             )
-            dyc_dx     = naca4_camber_dyc_dx(
+            dyc_dx    = naca4_camber_dyc_dx(
                 x,
                 max_camber_position=max_camber_position,
                 max_camber=max_camber
             )
-        theta     = np.arctan(dyc_dx)
-        upper_x = x      - thickness*np.sin(theta)
-        upper_y = camber + thickness*np.cos(theta)
-        lower_x = x      + thickness*np.sin(theta)
-        lower_y = camber - thickness*np.cos(theta)
-        return (
-            np.vstack([upper_x,upper_y]).transpose(),
-            np.vstack([lower_x,lower_y]).transpose(),
-        )
+        return naca_surfaces(x, thickness, camber, dyc_dx)
     return _naca4
+
+def naca4_many(max_thickness:ArrayLike, max_camber:ArrayLike, max_camber_position:ArrayLike):
+    """Batched `naca4`. Each parameter is an array with one value per profile (or a scalar shared by all of them),
+    and the generator returns `(upper, lower)` surfaces of shape `(k, n, 2)` from a single vectorised evaluation.
+
+    ```python
+    upper, lower = naca4_many(max_thickness=np.linspace(0.09, 0.13, 50), max_camber=0.02, max_camber_position=0.4)(n=100)
+    ```
+    """
+    max_thickness, max_camber, max_camber_position = (
+        parameter[:, np.newaxis] for parameter in np.broadcast_arrays(
+            np.atleast_1d(np.asarray(max_thickness,       dtype=float)),
+            np.atleast_1d(np.asarray(max_camber,          dtype=float)),
+            np.atleast_1d(np.asarray(max_camber_position, dtype=float)),
+        )
+    )
+    symmetric = max_camber==0
+
+    def _naca4_many(n:int=200)->tuple[np.ndarray,np.ndarray]:
+        x = cosine_spacing(n)
+        thickness = max_thickness/0.2*unit_thickness(n)
+        # symmetric profiles may have max_camber_position=0, which would divide by zero
+        with np.errstate(divide="ignore", invalid="ignore"):
+            camber    = np.where(symmetric, 0, naca4_camber(
+                x,
+                max_camber_position=max_camber_position,
+                max_camber=max_camber
+            ))
+            dyc_dx    = np.where(symmetric, 0, naca4_camber_dyc_dx(
+                x,
+                max_camber_position=max_camber_position,
+                max_camber=max_camber
+            ))
+        return naca_surfaces(x, thickness, camber, dyc_dx)
+    return _naca4_many
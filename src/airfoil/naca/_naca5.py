@@ -1,7 +1,8 @@
 from typing import Literal
 import numpy as np
-from ._naca4 import naca4_thickness
-from scipy.interpolate import interp1d
+from numpy.typing import ArrayLike
+from ._naca4 import naca_surfaces
+from ._naca_kernel import cosine_spacing, unit_thickness
 
 def naca5_camber_standard(x, k1, r):
     """Camber (standard) combining front and back sections"""
@@ -75,45 +76,44 @@ def get_naca5_parameters(type: Literal["standard","reflex"], camber_position: fl
     - k1: first camber parameter (scaled)
     - k2_k1: second camber parameter ratio (reflex only, scaled)
     """
+    r, k1, k2_k1 = get_naca5_parameters_many(type, camber_position, design_lift_coefficient)
+    return float(r[0]), float(k1[0]), None if k2_k1 is None else float(k2_k1[0])
+
+def get_naca5_parameters_many(
+    type: Literal["standard","reflex"],
+    camber_position: ArrayLike,
+    design_lift_coefficient: ArrayLike = 0.3,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray|None]:
+    """
+    Batched `get_naca5_parameters`, returning `(r, k1, k2_k1)` arrays with one value per profile (`k2_k1` is `None`
+    for standard profiles). The tables are interpolated linearly with `np.interp`.
+    """
+    camber_position, design_lift_coefficient = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(camber_position,         dtype=float)),
+        np.atleast_1d(np.asarray(design_lift_coefficient, dtype=float)),
+    )
     # Scale factor for design lift coefficient (tables are for CL = 0.3)
     scale_factor = design_lift_coefficient / 0.3
     
     if type == "standard":
         table = NACA5_STANDARD_TABLE
-        
-        # Check bounds
-        p_min, p_max = table['p'][0], table['p'][-1]
-        if camber_position < p_min or camber_position > p_max:
-            raise ValueError(f"camber_position must be between {p_min} and {p_max} for standard profiles")
-        
-        # Interpolate parameters
-        r_interp = interp1d(table['p'], table['r'], kind='linear')
-        k1_interp = interp1d(table['p'], table['k1'], kind='linear')
-        
-        r = float(r_interp(camber_position))
-        k1 = float(k1_interp(camber_position)) * scale_factor
-        k2_k1 = None
-        
     elif type == "reflex":
         table = NACA5_REFLEX_TABLE
-        
-        # Check bounds
-        p_min, p_max = table['p'][0], table['p'][-1]
-        if camber_position < p_min or camber_position > p_max:
-            raise ValueError(f"camber_position must be between {p_min} and {p_max} for reflex profiles")
-        
-        # Interpolate parameters
-        r_interp = interp1d(table['p'], table['r'], kind='linear')
-        k1_interp = interp1d(table['p'], table['k1'], kind='linear')
-        k2_k1_interp = interp1d(table['p'], table['k2_k1'], kind='linear')
-        
-        r = float(r_interp(camber_position))
-        k1 = float(k1_interp(camber_position)) * scale_factor
-        k2_k1 = float(k2_k1_interp(camber_position)) * scale_factor
-        
     else:
         raise ValueError("invalid type parameter")
     
+    # Check bounds
+    p_min, p_max = table['p'][0], table['p'][-1]
+    if np.any((camber_position < p_min) | (camber_position > p_max)):
+        raise ValueError(f"camber_position must be between {p_min} and {p_max} for {type} profiles")
+    
+    # Interpolate parameters
+    r = np.interp(camber_position, table['p'], table['r'])
+    k1 = np.interp(camber_position, table['p'], table['k1']) * scale_factor
+    k2_k1 = None
+    if type == "reflex":
+        k2_k1 = np.interp(camber_position, table['p'], table['k2_k1']) * scale_factor
+    
     return r, k1, k2_k1
 
 def naca5_camber(x: np.ndarray, type: Literal["standard","reflex"], k1: float, r: float, k2_k1: float|None = None) -> np.ndarray:
@@ -156,27 +156,56 @@ def naca5(
     # Get NACA5 parameters
     r, k1, k2_k1 = get_naca5_parameters(type, max_camber_position, design_lift_coefficient)
     
+    # one profile is generated on 1D arrays rather than through `naca5_many`, like `naca4`
     def _naca5(n: int = 200) -> tuple[np.ndarray, np.ndarray]:
-        beta = np.linspace(0, np.pi, n)
-        x = 0.5 * (1 - np.cos(beta))
-        #x = np.linspace(0,1,n)
+        x = cosine_spacing(n)
         
-        thickness = naca4_thickness(x, max_thickness=max_thickness)
+        thickness = max_thickness/0.2*unit_thickness(n)
         
         camber = naca5_camber(x, type, k1, r, k2_k1)
         
         dyc_dx = naca5_camber_dyc_dx(x, type, k1, r, k2_k1)
         
-        theta = np.arctan(dyc_dx)
+        return naca_surfaces(x, thickness, camber, dyc_dx)
+    
+    return _naca5
+
+def naca5_many(
+    type: Literal["standard","reflex"],
+    design_lift_coefficient: ArrayLike,
+    max_camber_position: ArrayLike,
+    max_thickness: ArrayLike,
+):
+    """
+    Batched `naca5`. Each numeric parameter is an array with one value per profile (or a scalar shared by all of
+    them), and the generator returns `(upper, lower)` surfaces of shape `(k, n, 2)` from a single vectorised
+    evaluation. All profiles share the same `type`.
+    """
+    design_lift_coefficient, max_camber_position, max_thickness = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(design_lift_coefficient, dtype=float)),
+        np.atleast_1d(np.asarray(max_camber_position,     dtype=float)),
+        np.atleast_1d(np.asarray(max_thickness,           dtype=float)),
+    )
+    assert np.all((0.05 <= design_lift_coefficient) & (design_lift_coefficient <= 1.00)), "design_lift_coefficient must be between 0.05 and 1.0"
+    assert np.all((0.01 <= max_thickness) & (max_thickness <= 0.3)), "maximum thickness must be between 0.01 and 0.3"
+    assert np.all((0.05 <= max_camber_position) & (max_camber_position <= 0.95)), "max_camber_position must be between 0.05 and 0.95"
+    
+    # Get NACA5 parameters
+    r, k1, k2_k1 = get_naca5_parameters_many(type, max_camber_position, design_lift_coefficient)
+    r, k1 = r[:, np.newaxis], k1[:, np.newaxis]
+    if k2_k1 is not None:
+        k2_k1 = k2_k1[:, np.newaxis]
+    max_thickness = max_thickness[:, np.newaxis]
+    
+    def _naca5_many(n: int = 200) -> tuple[np.ndarray, np.ndarray]:
+        x = cosine_spacing(n)
+        
+        thickness = max_thickness/0.2*unit_thickness(n)
         
-        upper_x = x - thickness * np.sin(theta)
-        upper_y = camber + thickness * np.cos(theta)
-        lower_x = x + thickness * np.sin(theta)
-        lower_y = camber - thickness * np.cos(theta)
+        camber = naca5_camber(x, type, k1, r, k2_k1)
+        
+        dyc_dx = naca5_camber_dyc_dx(x, type, k1, r, k2_k1)
         
-        return (
-            np.vstack([upper_x, upper_y]).transpose(),
-            np.vstack([lower_x, lower_y]).transpose(),
-        )
+        return naca_surfaces(x, thickness, camber, dyc_dx)
     
-    return _naca5
\ No newline at end of file
+    return _naca5_many
@@ -0,0 +1,19 @@
+from functools import cache
+import numpy as np
+
+@cache
+def cosine_spacing(n:int) -> np.ndarray:
+    """`n` chordwise stations from 0 to 1, clustered towards the leading and trailing edges. Cached and read-only."""
+    beta = np.linspace(0, np.pi, n)
+    x = 0.5 * (1 - np.cos(beta))
+    x.setflags(write=False)
+    return x
+
+@cache
+def unit_thickness(n:int) -> np.ndarray:
+    """The NACA 4-digit half thickness at each of `cosine_spacing(n)` for a max thickness of 0.2 (where the
+    polynomial is multiplied by exactly 1); scale by `max_thickness/0.2` for others. Cached and read-only."""
+    from ._naca4 import naca4_thickness
+    thickness = naca4_thickness(cosine_spacing(n), max_thickness=0.2)
+    thickness.setflags(write=False)
+    return thickness
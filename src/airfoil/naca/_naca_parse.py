@@ -1,8 +1,10 @@
 import re
-from typing import Callable
-from ._naca4 import naca4
-from ._naca5 import naca5
+from functools import cache
+import numpy as np
+from ._naca4 import naca4, naca4_many
+from ._naca5 import naca5, naca5_many
 
+@cache
 def _parse_naca(designation: str):
     """
     Parse NACA airfoil designation string and return appropriate airfoil generator function.
@@ -18,6 +20,20 @@ def _parse_naca(designation: str):
     Returns:
     - Callable airfoil generator function
     
+    Raises:
+    - ValueError: If designation format is invalid or parameters are out of range
+    """
+    series, parameters = _parse_naca_parameters(designation)
+    if series == 4:
+        return naca4(*parameters)
+    return naca5(*parameters)
+
+@cache
+def _parse_naca_parameters(designation: str) -> tuple[int, tuple]:
+    """
+    Parse a NACA designation into `(4, (max_thickness, max_camber, max_camber_position))` or
+    `(5, (type, design_lift_coefficient, max_camber_position, max_thickness))`, the arguments of `naca4` or `naca5`.
+    
     Raises:
     - ValueError: If designation format is invalid or parameters are out of range
     """
@@ -32,14 +48,14 @@ def _parse_naca(designation: str):
         raise ValueError(f"Invalid NACA designation: must contain only digits, got '{designation}'")
     
     if len(designation) == 4:
-        return _parse_naca4(designation)
+        return 4, _parse_naca4(designation)
     elif len(designation) == 5:
-        return _parse_naca5(designation)
+        return 5, _parse_naca5(designation)
     else:
         raise ValueError(f"Invalid NACA designation length: expected 4 or 5 digits, got {len(designation)} digits")
 
-def _parse_naca4(designation: str):
-    """Parse 4-digit NACA designation"""
+def _parse_naca4(designation: str) -> tuple[float, float, float]:
+    """Parse 4-digit NACA designation into the arguments of `naca4`"""
     if len(designation) != 4:
         raise ValueError(f"NACA 4-digit designation must be exactly 4 digits, got {len(designation)}")
     
@@ -61,13 +77,13 @@ def _parse_naca4(designation: str):
         if max_camber > 0 and (max_camber_position <= 0 or max_camber_position >= 1):
             raise ValueError(f"Maximum camber position {max_camber_position:.2f} out of range (0, 1)")
         
-        return naca4(max_thickness, max_camber, max_camber_position)
+        return max_thickness, max_camber, max_camber_position
         
     except (ValueError, IndexError) as e:
         raise ValueError(f"Invalid NACA 4-digit designation '{designation}': {str(e)}")
 
-def _parse_naca5(designation: str) -> Callable:
-    """Parse 5-digit NACA designation"""
+def _parse_naca5(designation: str) -> tuple[str, float, float, float]:
+    """Parse 5-digit NACA designation into the arguments of `naca5`"""
     if len(designation) != 5:
         raise ValueError(f"NACA 5-digit designation must be exactly 5 digits, got {len(designation)}")
     
@@ -101,7 +117,7 @@ def _parse_naca5(designation: str) -> Callable:
         if max_thickness < 0.01 or max_thickness > 0.3:
             raise ValueError(f"Maximum thickness {max_thickness:.3f} out of range [0.01, 0.3]")
         
-        return naca5(airfoil_type, design_lift_coefficient, max_camber_position, max_thickness)
+        return airfoil_type, design_lift_coefficient, max_camber_position, max_thickness
         
     except (ValueError, IndexError) as e:
         raise ValueError(f"Invalid NACA 5-digit designation '{designation}': {str(e)}")
@@ -178,4 +194,32 @@ def naca(designation: str, n_points: int = 200) -> tuple:
     - Tuple of (upper_surface, lower_surface) coordinate arrays
     """
     airfoil_generator = _parse_naca(designation)
-    return airfoil_generator(n_points)
\ No newline at end of file
+    return airfoil_generator(n_points)
+
+def naca_many(designations: list[str], n_points: int = 200) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Batched `naca`. Generate coordinates for many designations at once; profiles of the same series are generated
+    together by `naca4_many` or `naca5_many`.
+    
+    Parameters:
+    - designations: NACA designation strings, which may mix 4 and 5 digit series
+    - n_points: Number of points to generate (default: 200)
+    
+    Returns:
+    - Tuple of (upper_surface, lower_surface) coordinate arrays of shape `(len(designations), n_points, 2)`
+    """
+    parsed = [_parse_naca_parameters(designation) for designation in designations]
+    upper = np.empty((len(parsed), n_points, 2))
+    lower = np.empty((len(parsed), n_points, 2))
+    groups:dict[tuple, list[int]] = {}
+    for index, (series, parameters) in enumerate(parsed):
+        # naca5_many takes a single camber type
+        groups.setdefault((series, parameters[0] if series == 5 else None), []).append(index)
+    for (series, airfoil_type), indexes in groups.items():
+        columns = list(zip(*(parsed[index][1] for index in indexes)))
+        if series == 4:
+            generate = naca4_many(*columns)
+        else:
+            generate = naca5_many(airfoil_type, *columns[1:])
+        upper[indexes], lower[indexes] = generate(n_points)
+    return upper, lower
@@ -1,5 +1,5 @@
 from ._compensate_feedrate import compensate_feedrate
-from._project_line_to_plane import project_line_to_plane
+from ._project_line_to_plane import project_line_to_plane, project_lines_to_planes
 from ._array_helpers import (
     sliding_window,
     split_indexable,
@@ -19,13 +19,38 @@ from ._linestring_helpers import (
     split_linestring_by_angle,
     resample_spline_fallback_linear,
     resample_linear,
+    resample_linear_many,
     resample_shapes,
+    decimate_synchronized,
 )
-from ._shapely_helpers import (
-    plot_shapely,
-    plot_shapely_directional,
-)
-from ._pyvista_helpers import (
-    create_ruled_surface,
-    make_mesh_from_side_surfaces
-)
\ No newline at end of file
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from ._shapely_helpers import (
+        plot_shapely,
+        plot_shapely_directional,
+    )
+    from ._pyvista_helpers import (
+        create_ruled_surface,
+        create_ruled_surfaces,
+        mesh_from_polygon,
+        make_mesh_from_side_surfaces
+    )
+
+# plotting and meshing helpers import matplotlib and pyvista, so they are only loaded when first used
+_LAZY_IMPORTS = {
+    "plot_shapely"                 : "._shapely_helpers",
+    "plot_shapely_directional"     : "._shapely_helpers",
+    "create_ruled_surface"         : "._pyvista_helpers",
+    "create_ruled_surfaces"        : "._pyvista_helpers",
+    "mesh_from_polygon"            : "._pyvista_helpers",
+    "make_mesh_from_side_surfaces" : "._pyvista_helpers",
+}
+
+def __getattr__(name:str):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
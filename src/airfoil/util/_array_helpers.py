@@ -2,8 +2,6 @@ from collections import deque
 from itertools import islice, pairwise
 from typing import Generator, Iterable, Sequence, Callable
 import numpy as np
-from scipy import ndimage
-from scipy.signal.windows import gaussian
 
 
 def sliding_window[T](iterable:Iterable[T], n:int) -> Generator[tuple[T,...]]:
@@ -22,20 +20,65 @@ def split_indexable[T](arr:Sequence[T],indicies:list[int]) -> list[Sequence[T]]:
     return result
 
 
-def remove_sequential_duplicates[T](arr:np.ndarray) -> np.ndarray:
-    last = arr[0]
-    result = [last]
-    for item in arr[1:]:
-        if not np.allclose(item, last):
-            result.append(item)
-            last = item
-    return np.array(result)
+def remove_sequential_duplicates[T](arr:np.ndarray, atol:float=1e-8, rtol:float=1e-5) -> np.ndarray:
+    """Reduce contiguous runs of (nearly) identical items to their first occurrence.
+
+    `arr` has shape `(n,)` or `(n,d)`. Each item is compared to the last item kept, using the same rule as
+    `np.allclose(item, last_kept, rtol=rtol, atol=atol)`, so a run of small steps is thinned out rather than removed.
+
+    Steps are first compared to the item before them in one vectorised pass; an item whose step is not close and
+    whose predecessor was kept is always kept. Only runs of close steps (and the items after them, until an item is
+    kept again) are re-checked one by one against their anchor, converting just those slices to python, so input with
+    a few duplicates costs little more than the vectorised pass.
+    """
+    arr = np.asarray(arr)
+    if len(arr) < 2:
+        return arr.copy()
+    flat = arr.reshape(len(arr), -1)
+    close = (np.abs(flat[1:] - flat[:-1]) <= atol + rtol*np.abs(flat[:-1])).all(axis=-1)
+    keep = np.concatenate([[True], ~close])
+    # items `run_starts[i]` up to (not including) `run_ends[i]` are each close to the item before them
+    run_starts = np.flatnonzero(close & ~np.concatenate([[False], close[:-1]])) + 1
+    run_ends   = np.flatnonzero(close & ~np.concatenate([close[1:], [False]])) + 2
+
+    length = len(flat)
+    resume = 0
+    for start, end in zip(run_starts.tolist(), run_ends.tolist()):
+        if start < resume:
+            continue
+        # the item before `start` was kept, either by the vectorised pass or at the end of the previous walk
+        low, high = start-1, min(end+1, length)
+        items = flat[low:high].tolist()
+        anchor = items[0]
+        anchor_tolerance = [atol + rtol*abs(value) for value in anchor]
+        index = start
+        while index < length:
+            if index >= high:
+                # items after the run are still close to the anchor, so walk on through the next slice
+                low, high = high, min(high + max(end-start, 16), length)
+                items = flat[low:high].tolist()
+            item = items[index-low]
+            if all(abs(value-anchor_value) <= tolerance for value, anchor_value, tolerance in zip(item, anchor, anchor_tolerance)):
+                keep[index] = False
+            else:
+                keep[index] = True
+                anchor = item
+                anchor_tolerance = [atol + rtol*abs(value) for value in anchor]
+                if index+1 == length or not close[index]:
+                    break
+            index += 1
+        resume = index + 1
+    return arr[keep]
 
 
 def blur1d(values, count:int=31, std:int=6):
-    blur_kernel = gaussian(count, std)
+    """Gaussian blur of a 1d array, reflecting the ends. Same as `scipy.ndimage.convolve1d` with a normalised
+    `scipy.signal.windows.gaussian(count, std)` kernel"""
+    offset = np.arange(count) - (count-1)/2
+    blur_kernel = np.exp(-0.5*(offset/std)**2)
     blur_kernel /= blur_kernel.sum()
-    return ndimage.convolve1d(values,blur_kernel)
+    padded = np.pad(np.asarray(values, dtype=float), ((count-1)//2, count//2), mode="symmetric")
+    return np.correlate(padded, blur_kernel, mode="valid")
 
 
 def map_to_range(values:np.ndarray, min:float, max:float):
@@ -1,6 +1,5 @@
 from typing import Callable
 import numpy as np
-from scipy.interpolate import make_splprep
 
 from airfoil.util._array_helpers import (
     remove_sequential_duplicates,
@@ -73,6 +72,7 @@ def resample_spline_fallback_linear(
         total_length = np.linalg.norm(np.diff(chunk,axis=0),axis=1).sum()
         new_segment_count = int(number_of_points_from_total_distance(total_length))
         try:
+            from scipy.interpolate import make_splprep
             bspline, u = make_splprep(np.asarray(chunk).transpose())
             u_new = np.linspace(0, 1, new_segment_count)
             return bspline(u_new).transpose()
@@ -81,6 +81,26 @@ def resample_spline_fallback_linear(
             print(e)
             return resample_linear(chunk, lambda _: new_segment_count)
 
+def _interpolate_at_distances(
+        line:np.ndarray,
+        distances:np.ndarray,
+        target_distances:np.ndarray,
+        lowest_segment:np.ndarray|int,
+        highest_segment:np.ndarray|int,
+    ) -> np.ndarray:
+    """Interpolate points along `line` at `target_distances`, where `distances` is the cumulative distance of each
+    point in `line`. The segment used for each target is clamped to `[lowest_segment, highest_segment]`."""
+    index = np.clip(np.searchsorted(distances, target_distances, side="left")-1, lowest_segment, highest_segment)
+    segment_length = distances[index+1]-distances[index]
+    t = np.divide(
+        target_distances-distances[index],
+        segment_length,
+        out=np.zeros_like(target_distances),
+        where=segment_length>0
+    )
+    t = np.clip(t, 0, 1)[:,np.newaxis]
+    return line[index]+t*(line[index+1]-line[index])
+
 def resample_linear(
         line:np.ndarray,
         number_of_points_from_total_distance:Callable[[float], int]
@@ -88,7 +108,7 @@ def resample_linear(
     """line is a numpy array of shape (n,d) where n is the number of points and d is the number of dimentions. d must be >=2
     points_from_total_distance is a function that takes the total length of the line and returns the number of points to resample the linestring into.
     """
-    line = np.asarray(line)
+    line = np.asarray(line, dtype=float)
     assert line.shape[1]>=2, "line must be of dimention 2 or greater"
 
     # Calculate cumulative distances along the chunk
@@ -96,26 +116,64 @@ def resample_linear(
     distances = np.concatenate([[0], segment_lengths.cumsum()])
 
     total_distance = distances[-1]
+    number_of_points = int(number_of_points_from_total_distance(total_distance))
+    if len(line)<2:
+        return line[:min(number_of_points,1)].copy()
 
     # Create new points at evenly spaced distances
-    target_distances = np.linspace(0, total_distance, int(number_of_points_from_total_distance(total_distance)))
-    interpolated_points = []
-
-    base_index    = 0
-    for target_distance in target_distances:
-        while base_index<len(line)-1:
-            next_distance = distances[base_index+1]
-            if target_distance <= next_distance:
-                base_distance = distances[base_index]
-                t = (target_distance-base_distance)/(next_distance-base_distance)
-                interpolated_points.append(line[base_index]+t*(line[base_index+1]-line[base_index]))
-                break
-            else:
-                base_index+=1
-        if base_index==len(line)-1:
-            interpolated_points.append(line[-1])
-            break
-    return np.array(interpolated_points)
+    target_distances = np.linspace(0, total_distance, number_of_points)
+    return _interpolate_at_distances(line, distances, target_distances, 0, len(line)-2)
+
+def resample_linear_many(
+        lines:list[np.ndarray],
+        counts:list[int],
+    ) -> list[np.ndarray]:
+    """Equivalent to `[resample_linear(line, lambda _: count) for line, count in zip(lines, counts)]`
+    but all lines are resampled together in a single vectorised operation.
+
+    Each line is a numpy array of shape (n,d). All lines must have the same d. As in `resample_linear`, a line with
+    fewer than 2 points is not resampled; at most its first point is returned.
+    """
+    assert len(lines)==len(counts), "`lines` and `counts` must have the same length"
+    if len(lines)==0:
+        return []
+    line_lengths = np.array([len(line) for line in lines])
+    if (line_lengths<2).any():
+        long_lines = np.flatnonzero(line_lengths>=2).tolist()
+        result = [
+            np.asarray(line, dtype=float)[:min(int(count),1)].copy()
+            for line, count
+            in zip(lines, counts)
+        ]
+        resampled = resample_linear_many([lines[index] for index in long_lines], [counts[index] for index in long_lines])
+        for index, line in zip(long_lines, resampled):
+            result[index] = line
+        return result
+    counts = np.asarray(counts, dtype=int)
+
+    points = np.concatenate([np.asarray(line, dtype=float) for line in lines])
+    line_end   = line_lengths.cumsum()-1
+    line_start = line_end-line_lengths+1
+
+    # joins between consecutive lines are given zero length so they do not contribute to the distance along each line
+    segment_lengths = np.linalg.norm(points[1:] - points[:-1], axis=-1)
+    segment_lengths[line_end[:-1]] = 0
+    distances = np.concatenate([[0], segment_lengths.cumsum()])
+
+    line_index = np.repeat(np.arange(len(lines)), counts)
+    position_in_line = np.arange(counts.sum()) - np.repeat(counts.cumsum()-counts, counts)
+    fraction = position_in_line / np.repeat(np.maximum(counts-1, 1), counts)
+    start_distance = distances[line_start][line_index]
+    target_distances = start_distance + fraction*(distances[line_end][line_index]-start_distance)
+
+    result = _interpolate_at_distances(
+        points,
+        distances,
+        target_distances,
+        line_start[line_index],
+        line_end[line_index]-1,
+    )
+    return np.split(result, counts.cumsum()[:-1])
 
 def resample_linear_to_number_of_segments(line:np.ndarray, desired_segments:int):
     return resample_linear(line, lambda _:desired_segments)
@@ -123,6 +181,47 @@ def resample_linear_to_number_of_segments(line:np.ndarray, desired_segments:int)
 def resample_linear_to_segment_length(line:np.ndarray, desired_segment_length:float):
     return resample_linear(line, lambda total_distance:int(np.ceil(total_distance/desired_segment_length)))
 
+def decimate_synchronized(paths:list[np.ndarray], tolerance:float) -> np.ndarray:
+    """Returns the indices of the points to keep so that every path in `paths` stays within `tolerance` of its
+    original shape. All paths must have the same number of points, and the same points are removed from every path
+    so that point `i` of one path still corresponds to point `i` of the others.
+
+    This is Ramer-Douglas-Peucker where the error of a point is its greatest distance from the chord in any of the
+    paths. Rather than recursing, each pass splits every chord that is out of tolerance at once.
+    """
+    paths = [np.asarray(path, dtype=float) for path in paths]
+    count = len(paths[0])
+    assert all(len(path)==count for path in paths), "all paths must have the same number of points"
+    keep = np.zeros(count, dtype=bool)
+    keep[[0, -1]] = True
+    while True:
+        kept = np.flatnonzero(keep)
+        candidates = np.flatnonzero(~keep)
+        if len(candidates)==0:
+            return kept
+        chord = np.searchsorted(kept, candidates)-1
+        chord_start, chord_end = kept[chord], kept[chord+1]
+        error = np.zeros(len(candidates))
+        for path in paths:
+            start = path[chord_start]
+            direction = path[chord_end] - start
+            length_squared = np.einsum("ij,ij->i", direction, direction)
+            t = np.divide(
+                np.einsum("ij,ij->i", path[candidates]-start, direction),
+                length_squared,
+                out=np.zeros(len(candidates)),
+                where=length_squared>0,
+            )
+            nearest = start + np.clip(t, 0, 1)[:,np.newaxis]*direction
+            error = np.maximum(error, np.linalg.norm(path[candidates]-nearest, axis=-1))
+        # split each chord at its worst point, if that point is out of tolerance
+        worst = np.lexsort((-error, chord))
+        worst = worst[np.concatenate([[True], chord[worst][1:]!=chord[worst][:-1]])]
+        worst = worst[error[worst] > tolerance]
+        if len(worst)==0:
+            return kept
+        keep[candidates[worst]] = True
+
 def deflection_angle(path:np.ndarray):
     path = np.array(path)
     a, b, c = path[:-2], path[1:-1], path[2:]
@@ -182,6 +281,9 @@ def _make_segment_resampler_to_length(max_segment_length:float, core_resampler:C
 
 def _make_segment_resampler_to_counts(counts:list[int], core_resampler:Callable[[np.ndarray, Callable[[float],int]],np.ndarray]=resample_spline_fallback_linear) -> Callable[[list[np.ndarray]], list[np.ndarray]]:
     """set core_resampler=resample_linear to skip trying spline interpolation"""
+    if core_resampler is resample_linear:
+        # truncate to the shorter of the two, like the `zip` below
+        return lambda segments: resample_linear_many(segments[:len(counts)], counts[:len(segments)])
     return lambda segments: [
         core_resampler(
             segment,
@@ -1,17 +1,34 @@
-from typing import Literal
+from typing import Literal, Sequence
 import numpy as np
 
+Plane = Literal[
+    'xy',
+    'yx',
+    'xz',
+    'zx',
+    'yz',
+    'zy',
+]
+
+# Define basis vectors
+_x_axis = np.array([1, 0, 0])
+_y_axis = np.array([0, 1, 0])
+_z_axis = np.array([0, 0, 1])
+
+# Map plane strings to their cross product normals and the sign applied to plane_position
+_PLANE_NORMALS = {
+    'xy': (np.cross(_x_axis, _y_axis), +1),  # +z normal
+    'yx': (np.cross(_y_axis, _x_axis), -1),  # -z normal
+    'xz': (np.cross(_x_axis, _z_axis), -1),  # -y normal
+    'zx': (np.cross(_z_axis, _x_axis), +1),  # +y normal
+    'yz': (np.cross(_y_axis, _z_axis), +1),  # +x normal
+    'zy': (np.cross(_z_axis, _y_axis), -1),  # -x normal
+}
+
 def project_line_to_plane(
         p1: np.ndarray,
         p2: np.ndarray,
-        plane: Literal[
-            'xy',
-            'yx',
-            'xz',
-            'zx',
-            'yz',
-            'zy',
-        ],
+        plane: Plane,
         plane_position: float = 0.0
     ):
     """
@@ -38,25 +55,12 @@ def project_line_to_plane(
     Raises:
         ValueError: If plane is not a valid option
     """
-    # Define basis vectors
-    x_axis = np.array([1, 0, 0])
-    y_axis = np.array([0, 1, 0])
-    z_axis = np.array([0, 0, 1])
-    
-    # Map plane strings to their cross product normals and signed positions
-    plane_configs = {
-        'xy': (np.cross(x_axis, y_axis), +plane_position),  # +z normal
-        'yx': (np.cross(y_axis, x_axis), -plane_position),  # -z normal
-        'xz': (np.cross(x_axis, z_axis), -plane_position),  # -y normal
-        'zx': (np.cross(z_axis, x_axis), +plane_position),  # +y normal
-        'yz': (np.cross(y_axis, z_axis), +plane_position),  # +x normal
-        'zy': (np.cross(z_axis, y_axis), -plane_position),  # -x normal
-    }
-    if plane not in plane_configs:
-        valid_planes = list(plane_configs.keys())
+    if plane not in _PLANE_NORMALS:
+        valid_planes = list(_PLANE_NORMALS.keys())
         raise ValueError(f"Plane must be one of {valid_planes}. Got: {plane}")
     
-    normal, signed_position = plane_configs[plane]
+    normal, sign = _PLANE_NORMALS[plane]
+    signed_position = sign*plane_position
     
     # Direction vector of the line
     line_direction = p2 - p1
@@ -78,4 +82,48 @@ def project_line_to_plane(
     intersection = p1 + t[...,np.newaxis] * line_direction
 
     
-    return intersection
\ No newline at end of file
+    return intersection
+
+
+def project_lines_to_planes(
+        p1: np.ndarray,
+        p2: np.ndarray,
+        plane: Plane,
+        plane_positions: Sequence[float],
+    ) -> np.ndarray:
+    """
+    Project every line between corresponding rows of two curves onto several parallel coordinate planes at once.
+    
+    Equivalent to calling `project_line_to_plane(p1[i], p2[i], plane, position)` for each point pair and each
+    position, but the line directions and plane parameters are computed once for the whole curve.
+    
+    ```python
+    left, right = project_lines_to_planes(a_3d, b_3d, "yz", (-spacing/2, spacing/2))
+    ```
+    
+    Args:
+        p1: First curve as (n, 3) numpy array
+        p2: Second curve as (n, 3) numpy array
+        plane: Plane specification using cross product convention, see `project_line_to_plane`
+        plane_positions: (k,) distances from origin along the normal direction
+    
+    Returns:
+        np.ndarray: (k, n, 3) intersection of each line with each plane
+    
+    Raises:
+        ValueError: If plane is not a valid option or any line is parallel to the plane
+    """
+    if plane not in _PLANE_NORMALS:
+        valid_planes = list(_PLANE_NORMALS.keys())
+        raise ValueError(f"Plane must be one of {valid_planes}. Got: {plane}")
+    
+    normal, sign = _PLANE_NORMALS[plane]
+    p1 = np.asarray(p1, dtype=float)
+    line_direction = np.asarray(p2, dtype=float) - p1
+    denominator = line_direction @ normal
+    if (np.abs(denominator) < 1e-10).any():
+        raise ValueError("One of the line sections was parallel  to the plane")
+    
+    signed_positions = sign*np.asarray(plane_positions, dtype=float)
+    t = (signed_positions[:, np.newaxis] - (p1 @ normal)) / denominator
+    return p1 + t[..., np.newaxis] * line_direction
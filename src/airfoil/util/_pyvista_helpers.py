@@ -2,39 +2,59 @@ import numpy as np
 import pyvista as pv
 import shapely as sh
 
-def create_ruled_surface(curve_a, curve_b):
-    n_points = curve_a.shape[0]
-    # Points are ordered: [curve_a[0], curve_b[0], curve_a[1], curve_b[1], ...]
-    points = np.empty((2 * n_points, 3))
-    points[0::2] = curve_a  # Even indices: curve A
-    points[1::2] = curve_b  # Odd indices: curve B
-
-    faces = []
-    for i in range(n_points - 1):
-        # Quad Points: curve_a[i], curve_b[i], curve_b[i+1], curve_a[i+1]
-        p1 = 2 * i
-        p2 = 2 * i + 1
-        p3 = 2 * i + 3
-        p4 = 2 * i + 2
-        faces.extend([4, p1, p2, p3, p4])
-    
+def create_ruled_surface(curve_a:np.ndarray, curve_b:np.ndarray, triangulate:bool=False) -> pv.PolyData:
+    """Ruled surface between two (n,3) curves with matching point counts.
+    The result has one quad per segment, or two triangles per segment if `triangulate=True`"""
+    return create_ruled_surfaces([curve_a], [curve_b], triangulate=triangulate)
+
+def create_ruled_surfaces(curves_a:list[np.ndarray], curves_b:list[np.ndarray], triangulate:bool=False) -> pv.PolyData:
+    """Several ruled surfaces (e.g. one per wing segment) in a single `PolyData`.
+    `curves_a[i]` and `curves_b[i]` must have the same number of points, but each strip may have a different count."""
+    assert len(curves_a)==len(curves_b), "`curves_a` and `curves_b` must have the same length"
+    curves_a = [np.asarray(curve) for curve in curves_a]
+    curves_b = [np.asarray(curve) for curve in curves_b]
+    assert all(a.shape==b.shape for a,b in zip(curves_a, curves_b)), "each pair of curves must have the same shape"
+    n_points = np.array([len(curve) for curve in curves_a])
+
+    # Points are ordered: [curve_a[0], curve_b[0], curve_a[1], curve_b[1], ...] for each strip in turn
+    points = np.empty((2 * n_points.sum(), 3))
+    points[0::2] = np.concatenate(curves_a)  # Even indices: curve A
+    points[1::2] = np.concatenate(curves_b)  # Odd indices: curve B
+
+    # Quad Points: curve_a[i], curve_b[i], curve_b[i+1], curve_a[i+1]
+    n_quads = np.maximum(n_points-1, 0)
+    strip_start = 2*(n_points.cumsum()-n_points)
+    i = np.arange(n_quads.sum()) - np.repeat(n_quads.cumsum()-n_quads, n_quads)
+    p1 = np.repeat(strip_start, n_quads) + 2*i
+    quads = np.column_stack([p1, p1+1, p1+3, p1+2])
+
+    if triangulate:
+        cells = np.stack([quads[:,[0,1,2]], quads[:,[0,2,3]]], axis=1).reshape(-1,3)
+    else:
+        cells = quads
+    faces = np.column_stack([np.full(len(cells), cells.shape[1]), cells]).ravel()
+
     mesh = pv.PolyData(points, faces)
 
     return mesh
 
-def mesh_from_polygon(polygon:sh.Polygon|np.ndarray):
+def mesh_from_polygon(polygon:sh.Polygon|np.ndarray, normal_axis:int=0) -> pv.PolyData:
     """Uses shapely's superior constrained_delaunay_triangles instead of pyvista's delaunay.
     Therefore the input has to be a shapely polygon or a (n,2) numpy array of xy points.
-    The output will be a pyvista mesh."""
+    The output will be a pyvista mesh in the plane where coordinate `normal_axis` is 0: by default x=0, with the
+    polygon's xy as the mesh's yz (as `make_mesh_from_side_surfaces` expects), or z=0 with `normal_axis=2`.
+
+    Only triangles whose centroid lies inside the polygon are kept. Triangles share vertices, so the mesh does not
+    need to be cleaned afterwards."""
     pol = sh.Polygon(polygon)
-    triangles = sh.constrained_delaunay_triangles(pol)
-    return pv.merge([
-        pv.PolyData(
-            np.insert(coords:=geom.exterior.coords[:-1],0, 0,-1),
-            faces=[[len(coords), *range(len(coords))]]
-        )
-        for geom in triangles.geoms
-    ])
+    triangles = sh.get_parts(sh.constrained_delaunay_triangles(pol))
+    coords = sh.get_coordinates(sh.get_exterior_ring(triangles)).reshape(-1,4,2)[:,:3]
+    centroids = coords.mean(axis=1)
+    coords = coords[sh.contains_xy(pol, centroids[:,0], centroids[:,1])]
+    vertices, cells = np.unique(coords.reshape(-1,2), axis=0, return_inverse=True)
+    cells = cells.reshape(-1,3)
+    faces = np.column_stack([np.full(len(cells), 3), cells]).ravel()
+    return pv.PolyData(np.insert(vertices, normal_axis, 0, axis=-1), faces)
 
 def make_mesh_from_side_surfaces(a:np.ndarray, b:np.ndarray, width:float=150):
     """uses related function `create_rules_surface` and `mesh_from_polygon`
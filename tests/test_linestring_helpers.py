@@ -0,0 +1,32 @@
+import numpy as np
+
+from airfoil.util._linestring_helpers import (
+    _make_segment_resampler_to_counts,
+    resample_linear,
+    resample_linear_many,
+)
+
+
+def test_resample_linear_many_single_point_lines():
+    lines  = [np.array([[0., 0.], [3., 4.]]), np.array([[1., 1.]]), np.array([[0., 0.], [0., 2.], [2., 2.]])]
+    counts = [5, 4, 3]
+    result = resample_linear_many(lines, counts)
+    expected = [resample_linear(line, lambda _, count=count: count) for line, count in zip(lines, counts)]
+    assert len(result) == len(expected)
+    for a, b in zip(result, expected):
+        assert np.array_equal(a, b)
+    assert np.array_equal(result[1], [[1., 1.]])
+
+
+def test_segment_resampler_to_counts_truncates_like_zip():
+    segments = [np.array([[0., 0.], [1., 0.]]), np.array([[1., 0.], [1., 1.]]), np.array([[1., 1.]])]
+    linear = _make_segment_resampler_to_counts([3, 4], core_resampler=resample_linear)
+    result = linear(segments)
+    assert [len(segment) for segment in result] == [3, 4]
+    assert np.allclose(result[0], [[0, 0], [0.5, 0], [1, 0]])
+
+    result = linear(segments[:1])
+    assert [len(segment) for segment in result] == [3]
+
+    result = _make_segment_resampler_to_counts([2, 2, 2], core_resampler=resample_linear)(segments)
+    assert np.array_equal(result[2], [[1., 1.]])
@@ -0,0 +1,19 @@
+import numpy as np
+
+from airfoil import Airfoil
+from airfoil.util import ensure_closed, make_mesh_from_side_surfaces, mesh_from_polygon
+
+
+def test_make_mesh_from_side_surfaces_is_manifold():
+    a = ensure_closed(Airfoil.from_naca_designation("2412", chord_length=150, points=60).points)
+    b = ensure_closed(Airfoil.from_naca_designation("0012", chord_length=100, points=60).points)
+    mesh = make_mesh_from_side_surfaces(a, b, width=200)
+    assert mesh.is_manifold
+    assert np.allclose(np.unique(mesh.points[:, 0]), [-100, 100])
+
+
+def test_mesh_from_polygon_plane():
+    square = np.array([[0, 0], [2, 0], [2, 1], [0, 1]], dtype=float)
+    assert np.all(mesh_from_polygon(square).points[:, 0] == 0)
+    assert np.all(mesh_from_polygon(square, normal_axis=2).points[:, 2] == 0)
+    assert mesh_from_polygon(square).n_cells == 2